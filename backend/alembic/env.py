@@ -1,3 +1,4 @@
+import os
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
@@ -19,6 +20,12 @@ if config.config_file_name is not None:
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 
+# Migrate the database the app is configured for, not just alembic.ini's
+if os.getenv("DATABASE_URL"):
+    from app.db.session import DATABASE_URL
+
+    config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+
 import app.db.base  # registers models
 from app.db.base_class import Base
 
@@ -26,6 +33,16 @@ from app.models import user
 
 target_metadata = Base.metadata
 
+# Full-text search objects (app/db/search.py) live outside the ORM models;
+# keep autogenerate from proposing to drop them.
+SEARCH_OBJECTS = {"items_fts", "search_vector", "ix_items_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if reflected and (name in SEARCH_OBJECTS or name.startswith("items_fts_")):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -50,6 +67,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -70,7 +88,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
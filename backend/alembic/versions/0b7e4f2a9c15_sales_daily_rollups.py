@@ -0,0 +1,38 @@
+"""Sales daily rollups
+
+Revision ID: 0b7e4f2a9c15
+Revises: f3c9a1d7b254
+Create Date: 2026-10-18 18:20:37.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e4f2a9c15'
+down_revision: Union[str, Sequence[str], None] = 'f3c9a1d7b254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sales_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('item_number', sa.String(length=50), nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('subtotal', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('tax', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'category', 'item_number')
+    )
+    # Existing orders: python -m app.scripts.rebuild_sales_rollups
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sales_daily')
@@ -0,0 +1,32 @@
+"""Item listing indexes
+
+Revision ID: 5c1e2f7d9a40
+Revises: a3bda70aa529
+Create Date: 2026-10-18 09:12:41.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e2f7d9a40'
+down_revision: Union[str, Sequence[str], None] = 'a3bda70aa529'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_items_name_id', 'items', ['name', 'id'], unique=False)
+    op.create_index('ix_items_category_id', 'items', ['category', 'id'], unique=False)
+    op.create_index('ix_items_category_subcategory_id', 'items', ['category', 'subcategory', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_items_category_subcategory_id', table_name='items')
+    op.drop_index('ix_items_category_id', table_name='items')
+    op.drop_index('ix_items_name_id', table_name='items')
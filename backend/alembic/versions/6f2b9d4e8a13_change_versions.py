@@ -0,0 +1,33 @@
+"""Change versions
+
+Revision ID: 6f2b9d4e8a13
+Revises: d5a8c3e1f907
+Create Date: 2026-10-18 23:12:40.527316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f2b9d4e8a13'
+down_revision: Union[str, Sequence[str], None] = 'd5a8c3e1f907'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'change_versions',
+        sa.Column('key', sa.String(length=100), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('change_versions')
@@ -0,0 +1,100 @@
+"""Item full text search
+
+Revision ID: 9d4b6a1c3e72
+Revises: 5c1e2f7d9a40
+Create Date: 2026-10-18 10:03:15.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b6a1c3e72'
+down_revision: Union[str, Sequence[str], None] = '5c1e2f7d9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE items_fts USING fts5(
+        name, description, item_number, category,
+        content='items', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts(rowid, name, description, item_number, category)
+        VALUES (new.id, new.name, new.description, new.item_number, new.category);
+    END
+    """,
+    """
+    CREATE TRIGGER items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, description, item_number, category)
+        VALUES ('delete', old.id, old.name, old.description, old.item_number, old.category);
+    END
+    """,
+    """
+    CREATE TRIGGER items_fts_au
+    AFTER UPDATE OF name, description, item_number, category ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, description, item_number, category)
+        VALUES ('delete', old.id, old.name, old.description, old.item_number, old.category);
+        INSERT INTO items_fts(rowid, name, description, item_number, category)
+        VALUES (new.id, new.name, new.description, new.item_number, new.category);
+    END
+    """,
+    # backfill existing rows
+    "INSERT INTO items_fts(items_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS items_fts_au",
+    "DROP TRIGGER IF EXISTS items_fts_ad",
+    "DROP TRIGGER IF EXISTS items_fts_ai",
+    "DROP TABLE IF EXISTS items_fts",
+]
+
+# A STORED generated column is computed for existing rows by the ALTER itself
+POSTGRES_UPGRADE = [
+    """
+    ALTER TABLE items ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(item_number, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(category, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX ix_items_search_vector ON items USING gin (search_vector)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_items_search_vector",
+    "ALTER TABLE items DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements: list[str]) -> None:
+    for stmt in statements:
+        op.execute(stmt)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        _run(SQLITE_UPGRADE)
+    elif dialect == "postgresql":
+        _run(POSTGRES_UPGRADE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        _run(SQLITE_DOWNGRADE)
+    elif dialect == "postgresql":
+        _run(POSTGRES_DOWNGRADE)
@@ -0,0 +1,32 @@
+"""User updated_at
+
+Revision ID: d5a8c3e1f907
+Revises: 0b7e4f2a9c15
+Create Date: 2026-10-18 21:05:12.418093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a8c3e1f907'
+down_revision: Union[str, Sequence[str], None] = '0b7e4f2a9c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_users_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_index('ix_users_updated_at')
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,44 @@
+"""Item stock shards
+
+Revision ID: f3c9a1d7b254
+Revises: e8a2d4c6f031
+Create Date: 2026-10-18 16:42:10.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9a1d7b254'
+down_revision: Union[str, Sequence[str], None] = 'e8a2d4c6f031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('items', sa.Column('stock_shards', sa.Integer(), server_default='0', nullable=False))
+    op.create_table('item_stock_shards',
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('shard', sa.Integer(), nullable=False),
+    sa.Column('qty', sa.Integer(), nullable=False),
+    sa.CheckConstraint('qty >= 0', name='ck_item_stock_shards_qty'),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('item_id', 'shard')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Put sharded stock back into the column before dropping the shards
+    op.execute(
+        "UPDATE items SET qty_in_stock = ("
+        "SELECT COALESCE(SUM(qty), 0) FROM item_stock_shards "
+        "WHERE item_stock_shards.item_id = items.id) "
+        "WHERE stock_shards > 0"
+    )
+    op.drop_table('item_stock_shards')
+    op.drop_column('items', 'stock_shards')
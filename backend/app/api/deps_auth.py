@@ -1,40 +1,92 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+import time
 
+from fastapi import Depends, HTTPException, Query, Request, status
+from fastapi.security import OAuth2PasswordBearer
+from app.core.auth_cache import (
+    Principal,
+    cache_principal,
+    claim_user_changes_poll,
+    current_generation,
+    principal_cache,
+    token_cache,
+)
 from app.core.config import SECRET_KEY, ALGORITHM
-from app.db.deps import get_db
-from app.models.user import User
+from app.db.deps import get_db, run_db
+from app.services.auth_service import expire_changed_users, get_active_user_by_email
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
+async def get_current_user(
+    db=Depends(get_db),
     token: str = Depends(oauth2_scheme),
-) -> User:
+) -> Principal:
+    return await resolve_principal(db, token)
+
+
+async def get_stream_user(
+    request: Request,
+    access_token: str | None = Query(None),
+    # Released before the response starts; a stream can stay open for hours
+    db=Depends(get_db, scope="function"),
+) -> Principal:
+    """get_current_user for long-lived streams.
+
+    EventSource cannot send an Authorization header, so the access token
+    may also come as ?access_token=.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        token = access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await resolve_principal(db, token)
+
+
+async def resolve_principal(db, token: str) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid authentication credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str | None = payload.get("sub")
-        if not email:
+    email: str | None = token_cache.get(token)
+    if email is None:
+        # python-jose is slow to import; most requests hit the token cache
+        from jose import JWTError, jwt
+
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            email = payload.get("sub")
+            if not email:
+                raise credentials_exception
+        except JWTError:
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+        # never keep a token cached past its own expiry
+        exp = payload.get("exp")
+        if exp is not None:
+            token_cache.set(token, email, ttl=float(exp) - time.time())
+
+    since = claim_user_changes_poll()
+    if since is not None:
+        await run_db(db, expire_changed_users, since)
 
+    principal: Principal | None = principal_cache.get(email)
+    if principal is not None:
+        return principal
+
+    generation = current_generation()
     # IMPORTANT: deleted users cannot authenticate
-    user = (
-        db.query(User)
-        .filter(User.email == email, User.is_deleted == False)  # noqa: E712
-        .first()
-    )
+    user = await run_db(db, get_active_user_by_email, email)
     if not user:
         raise credentials_exception
 
-    return user
+    principal = Principal(
+        id=user.id, email=user.email, full_name=user.full_name, role=user.role
+    )
+    cache_principal(principal, generation)
+    return principal
@@ -1,10 +1,10 @@
 from fastapi import Depends, HTTPException, status
 from app.api.deps_auth import get_current_user
-from app.models.user import User
+from app.core.auth_cache import Principal
 
 
 def require_role(*allowed_roles: str):
-    def _dep(current_user: User = Depends(get_current_user)) -> User:
+    def _dep(current_user: Principal = Depends(get_current_user)) -> Principal:
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
 
-from app.db.deps import get_db
+from app.db.deps import get_db, run_db
 from app.api.deps_auth import get_current_user
+from app.core.auth_cache import cache_stats
+from app.core.events import event_hub
+from app.db.pool import pool_status
+from app.db.session import async_engine, engine
 from app.schemas.user import UserRead
-from app.models.user import User
+from app.services.user_service import change_user_role
 from pydantic import BaseModel
 
 
@@ -22,9 +25,9 @@ def require_admin(user: UserRead):
 
 
 @router.post("/change-role")
-def change_role(
+async def change_role(
     body: ChangeRoleBody,
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
     user: UserRead = Depends(get_current_user),
 ):
     require_admin(user)
@@ -35,13 +38,29 @@ def change_role(
     if role not in ("admin", "shop"):
         raise HTTPException(status_code=400, detail="Role must be 'admin' or 'shop'")
 
-    target = db.query(User).filter(User.email == email).first()
+    target = await run_db(db, change_user_role, email, role)
     if not target:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # hard safety: you can keep this or remove it
-    # prevents accidentally demoting your only admin, etc.
-    target.role = role
-    db.commit()
-
     return {"ok": True, "email": email, "role": role}
+
+
+@router.get("/principal-cache")
+async def principal_cache_stats(user: UserRead = Depends(get_current_user)):
+    require_admin(user)
+    return cache_stats()
+
+
+@router.get("/db-pool")
+async def db_pool_stats(user: UserRead = Depends(get_current_user)):
+    require_admin(user)
+    return {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine) if async_engine is not None else None,
+    }
+
+
+@router.get("/event-stream")
+async def event_stream_stats(user: UserRead = Depends(get_current_user)):
+    require_admin(user)
+    return event_hub.stats()
@@ -0,0 +1,99 @@
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.api.deps_auth import get_current_user
+from app.core.config import REORDER_LEAD_TIME_DAYS, REORDER_REVIEW_DAYS
+from app.db.deps import get_db, run_db
+from app.schemas.analytics import ReorderSuggestion, SalesPoint, SalesTopEntry
+from app.schemas.user import UserRead
+from app.services.analytics_service import default_range, sales_series, top_sales
+
+router = APIRouter()
+
+
+def require_admin(user: UserRead):
+    if user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+
+
+def _range(start: date | None, end: date | None) -> tuple[date, date]:
+    try:
+        return default_range(start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/sales", response_model=list[SalesPoint])
+async def sales_series_endpoint(
+    start: date | None = None,
+    end: date | None = None,
+    interval: Literal["day", "week", "month"] = "day",
+    category: str | None = None,
+    item_number: str | None = None,
+    db=Depends(get_db),
+    user: UserRead = Depends(get_current_user),
+):
+    """Sales over time from the daily rollups (default: the last 30 days)."""
+    require_admin(user)
+    start, end = _range(start, end)
+    return await run_db(
+        db,
+        sales_series,
+        start,
+        end,
+        interval=interval,
+        category=category,
+        item_number=item_number,
+    )
+
+
+@router.get("/top", response_model=list[SalesTopEntry])
+async def top_sales_endpoint(
+    start: date | None = None,
+    end: date | None = None,
+    by: Literal["item", "category"] = "item",
+    metric: Literal["subtotal", "units", "tax", "order_count"] = "subtotal",
+    limit: int = Query(10, ge=1, le=100),
+    category: str | None = None,
+    db=Depends(get_db),
+    user: UserRead = Depends(get_current_user),
+):
+    """Best selling items or categories from the daily rollups."""
+    require_admin(user)
+    start, end = _range(start, end)
+    return await run_db(
+        db,
+        top_sales,
+        start,
+        end,
+        by=by,
+        metric=metric,
+        limit=limit,
+        category=category,
+    )
+
+
+@router.get("/reorder", response_model=list[ReorderSuggestion])
+async def reorder_endpoint(
+    include_all: bool = Query(False, alias="all"),
+    limit: int | None = Query(None, ge=1),
+    lead_time_days: float = Query(REORDER_LEAD_TIME_DAYS, gt=0),
+    review_days: float = Query(REORDER_REVIEW_DAYS, ge=0),
+    db=Depends(get_db),
+    user: UserRead = Depends(get_current_user),
+):
+    """Items to reorder, least days of cover first (all=true: every item)."""
+    require_admin(user)
+    # numpy loads with the first report, not with the app
+    from app.services.reorder_service import reorder_suggestions
+
+    return await run_db(
+        db,
+        reorder_suggestions,
+        lead_time_days=lead_time_days,
+        review_days=review_days,
+        include_all=include_all,
+        limit=limit,
+    )
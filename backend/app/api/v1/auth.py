@@ -1,13 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 from app.api.v1 import admin
 
 
-from app.db.deps import get_db
-from app.schemas.auth import Token
+from app.db.deps import get_db, run_db
+from app.schemas.auth import RefreshRequest, Token
 from app.core.jwt import create_access_token
-from app.services.auth_service import authenticate_user
+from app.services.auth_service import authenticate_user_async
+from app.services.refresh_token_service import (
+    issue_refresh_token,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
 
 router = APIRouter()
 
@@ -15,12 +19,14 @@ router.include_router(admin.router, prefix="/admin", tags=["admin"])
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
 ):
     # OAuth2PasswordRequestForm uses "username" field (we will treat it as email)
-    user = authenticate_user(db, email=form_data.username, password=form_data.password)
+    user = await authenticate_user_async(
+        db, email=form_data.username, password=form_data.password
+    )
     if not user:
         # Generic on purpose (don't leak whether email exists)
         raise HTTPException(
@@ -29,4 +35,26 @@ def login(
         )
 
     token = create_access_token(subject=user.email)
-    return Token(access_token=token)
+    refresh_token = await run_db(db, issue_refresh_token, user.id)
+    return Token(access_token=token, refresh_token=refresh_token)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(body: RefreshRequest, db=Depends(get_db)):
+    # No password hashing here: one indexed lookup by token hash + rotation
+    rotated = await run_db(db, rotate_refresh_token, body.refresh_token)
+    if not rotated:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+    email, refresh_token = rotated
+    return Token(
+        access_token=create_access_token(subject=email), refresh_token=refresh_token
+    )
+
+
+@router.post("/logout", status_code=204)
+async def logout(body: RefreshRequest, db=Depends(get_db)):
+    await run_db(db, revoke_refresh_token, body.refresh_token)
+    return
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, Header
+from fastapi.sse import EventSourceResponse, ServerSentEvent
+
+from app.api.deps_auth import get_stream_user
+from app.core.auth_cache import Principal
+from app.core.events import Event, event_hub
+
+router = APIRouter()
+
+
+def _to_sse(event: Event) -> ServerSentEvent:
+    return ServerSentEvent(
+        event=event.type, data=event.data, id=event_hub.event_id(event)
+    )
+
+
+@router.get("", response_class=EventSourceResponse)
+async def stream_events(
+    user: Principal = Depends(get_stream_user),
+    last_event_id: str | None = Header(None),
+):
+    """Live stock_changed and order_status_changed events.
+
+    Shop users get stock changes and their own orders; admins get every
+    order. A "resync" event means events were missed and the client should
+    reload its data.
+    """
+    sub, backlog = event_hub.subscribe(user.id, user.role == "admin", last_event_id)
+    try:
+        last_sent = 0
+        if backlog is None:
+            yield ServerSentEvent(event="resync", data={})
+            backlog = []
+        for event in backlog:
+            last_sent = event.id
+            yield _to_sse(event)
+
+        while True:
+            event = await sub.queue.get()
+            if event is None:
+                # evicted as a slow consumer; the client reconnects and resumes
+                return
+            # a publish racing with subscribe can arrive both ways
+            if event.id <= last_sent:
+                continue
+            last_sent = event.id
+            yield _to_sse(event)
+    finally:
+        event_hub.unsubscribe(sub)
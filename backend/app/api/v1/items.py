@@ -1,18 +1,50 @@
-import os
-import uuid
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
-from sqlalchemy.orm import Session
+from typing import Literal
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    UploadFile,
+    File,
+    Query,
+    Request,
+    Body,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from app.schemas.items import ItemUpdate
-from app.services.item_service import update_item_by_item_number
+from app.services.item_service import batch_update_items, update_item_by_item_number
 
-from app.db.deps import get_db
-from app.schemas.items import ItemCreate, ItemRead
+from app.core.responses import FastJSONResponse
+from app.core.versions import CATALOG, etag_for, not_modified, set_etag
+from app.db.deps import get_db, run_db, stream_partitions
+from app.core.config import ITEM_BATCH_MAX
+from app.schemas.items import (
+    ItemBatchResult,
+    ItemBatchUpdate,
+    ItemCreate,
+    ItemImportReport,
+    ItemRead,
+    ItemStockShardsUpdate,
+)
+from app.services.catalog_service import (
+    detect_format,
+    export_header,
+    export_rows,
+    import_items,
+    item_export_query,
+)
 from app.services.item_service import (
-    list_items,
+    list_item_records,
+    search_items,
     create_item,
     delete_item_by_item_number,
+    set_item_stock_shards,
     update_item_image_url,
 )
+from app.services.image_service import schedule_variants
+from app.services.upload_service import UploadLimitRoute, store_image
 
 # You likely already have auth deps like get_current_user; adapt name as needed
 from app.api.deps_auth import get_current_user  # <-- adjust to your project
@@ -20,6 +52,8 @@ from app.schemas.user import UserRead  # <-- adjust
 
 router = APIRouter()
 
+CATALOG_CACHE_CONTROL = "no-cache"
+
 
 def require_admin(user: UserRead):
     if user.role != "admin":
@@ -27,76 +61,202 @@ def require_admin(user: UserRead):
 
 
 @router.get("/", response_model=list[ItemRead])
-def get_items(db: Session = Depends(get_db)):
-    return list_items(db)
+async def get_items(
+    request: Request,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = None,
+    sort: Literal["id", "name"] = "id",
+    category: str | None = None,
+    subcategory: str | None = None,
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    in_stock: bool = False,
+    db=Depends(get_db),
+):
+    etag = await run_db(db, etag_for, CATALOG)
+    cached = not_modified(request, etag, CATALOG_CACHE_CONTROL)
+    if cached:
+        return cached
+
+    try:
+        items, next_cursor = await run_db(
+            db,
+            list_item_records,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            category=category,
+            subcategory=subcategory,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Records are already in ItemRead's shape; skip the second validation pass
+    response = FastJSONResponse(items)
+    # Body stays a plain list; the next page is advertised out of band
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    set_etag(response, etag, CATALOG_CACHE_CONTROL)
+    return response
+
+
+@router.get("/search", response_model=list[ItemRead])
+async def search_items_endpoint(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db=Depends(get_db),
+):
+    etag = await run_db(db, etag_for, CATALOG)
+    cached = not_modified(request, etag, CATALOG_CACHE_CONTROL)
+    if cached:
+        return cached
+
+    items = await run_db(db, search_items, q, limit=limit)
+    set_etag(response, etag, CATALOG_CACHE_CONTROL)
+    return items
+
+
+@router.get("/export")
+async def export_items_endpoint(
+    format: Literal["csv", "ndjson"] = "csv",
+    db=Depends(get_db),
+    user: UserRead = Depends(get_current_user),
+):
+    require_admin(user)
+
+    async def body():
+        yield export_header(format)
+        async for rows in stream_partitions(db, item_export_query()):
+            yield export_rows(rows, format)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="items.{format}"'},
+    )
+
+
+@router.post("/import", response_model=ItemImportReport)
+async def import_items_endpoint(
+    file: UploadFile = File(...),
+    format: Literal["csv", "ndjson"] | None = None,
+    db=Depends(get_db),
+    user: UserRead = Depends(get_current_user),
+):
+    require_admin(user)
+
+    fmt = format or detect_format(file.filename, file.content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=400, detail="Upload a .csv or .ndjson file, or pass ?format="
+        )
+    try:
+        return await run_db(db, import_items, file.file, fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/", response_model=ItemRead)
-def create_item_endpoint(
+async def create_item_endpoint(
     item_in: ItemCreate,
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
     user: UserRead = Depends(get_current_user),
 ):
     require_admin(user)
     try:
-        return create_item(db, item_in)
+        return await run_db(db, create_item, item_in)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/{item_number}", status_code=204)
-def delete_item_endpoint(
+async def delete_item_endpoint(
     item_number: str,
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
     user: UserRead = Depends(get_current_user),
 ):
     require_admin(user)
-    ok = delete_item_by_item_number(db, item_number)
+    ok = await run_db(db, delete_item_by_item_number, item_number)
     if not ok:
         raise HTTPException(status_code=404, detail="Item not found")
     return
 
 
-@router.post("/{item_number}/image", response_model=ItemRead)
-def upload_item_image(
+async def upload_item_image(
     item_number: str,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
     user: UserRead = Depends(get_current_user),
 ):
     require_admin(user)
 
-    uploads_dir = "app/static/uploads"
-    os.makedirs(uploads_dir, exist_ok=True)
-
-    ext = os.path.splitext(file.filename or "")[1].lower()
-    if ext not in [".png", ".jpg", ".jpeg", ".webp"]:
-        raise HTTPException(status_code=400, detail="Unsupported image type")
-
-    filename = f"{item_number}-{uuid.uuid4().hex}{ext}"
-    path = os.path.join(uploads_dir, filename)
-
-    contents = file.file.read()
-    with open(path, "wb") as f:
-        f.write(contents)
+    filename = await store_image(file)
 
     image_url = f"/static/uploads/{filename}"
-    updated = update_item_image_url(db, item_number, image_url)
+    updated = await run_db(db, update_item_image_url, item_number, image_url)
     if not updated:
         raise HTTPException(status_code=404, detail="Item not found")
 
+    # In the threadpool after the response: with IMAGE_WORKERS=0 the
+    # resizing itself runs there
+    background_tasks.add_task(schedule_variants, filename)
+
     return updated
 
 
+# Registered by hand for route_class_override: the body limit applies
+# before FastAPI reads the form
+router.add_api_route(
+    "/{item_number}/image",
+    upload_item_image,
+    methods=["POST"],
+    response_model=ItemRead,
+    route_class_override=UploadLimitRoute,
+)
+
+
 @router.put("/{item_number}", response_model=ItemRead)
-def update_item_endpoint(
+async def update_item_endpoint(
     item_number: str,
     item_in: ItemUpdate,
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
+    user: UserRead = Depends(get_current_user),
+):
+    require_admin(user)
+    updated = await run_db(db, update_item_by_item_number, item_number, item_in)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return updated
+
+
+@router.put("/{item_number}/stock-shards", response_model=ItemRead)
+async def set_stock_shards_endpoint(
+    item_number: str,
+    body: ItemStockShardsUpdate,
+    db=Depends(get_db),
     user: UserRead = Depends(get_current_user),
 ):
+    """Spread a hot item's stock over several rows so concurrent checkouts
+    don't queue on one row lock. The reported qty_in_stock is unchanged."""
     require_admin(user)
-    updated = update_item_by_item_number(db, item_number, item_in)
+    updated = await run_db(db, set_item_stock_shards, item_number, body.shards)
     if not updated:
         raise HTTPException(status_code=404, detail="Item not found")
     return updated
+
+
+@router.patch("/batch", response_model=ItemBatchResult)
+async def batch_update_items_endpoint(
+    updates: list[ItemBatchUpdate] = Body(..., min_length=1, max_length=ITEM_BATCH_MAX),
+    db=Depends(get_db),
+    user: UserRead = Depends(get_current_user),
+):
+    require_admin(user)
+    return await run_db(db, batch_update_items, updates)
@@ -1,18 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from app.db.deps import get_db
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+
+from app.core.responses import FastJSONResponse
+from app.core.versions import (
+    ALL_ORDERS,
+    etag_for,
+    not_modified,
+    set_etag,
+    user_orders,
+)
+from app.db.deps import get_db, run_db
 from app.api.deps_auth import get_current_user
 from app.schemas.user import UserRead
 from app.schemas.orders import OrderCreate, OrderRead
-from app.models.order import Order
-from app.models.order_item import OrderItem
-from app.services.item_service import get_item_by_item_number
-
-TAX_RATE = 0.0825
+from app.services.order_service import (
+    ORDER_STATUSES,
+    list_order_records,
+    place_order,
+    set_order_status as set_order_status_in_db,
+)
 
 router = APIRouter()
 
+# Order lists are per-user; keep them out of shared caches
+ORDERS_CACHE_CONTROL = "private, no-cache"
+
 
 def require_shop(user: UserRead):
     if user.role != "shop":
@@ -27,104 +39,106 @@ def require_admin(user: UserRead):
 
 
 @router.post("/checkout", response_model=OrderRead)
-def checkout(
+async def checkout(
     payload: OrderCreate,
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
     user: UserRead = Depends(get_current_user),
 ):
     require_shop(user)
-
-    if not payload.lines:
-        raise HTTPException(status_code=400, detail="Cart is empty")
-
-    subtotal = 0.0
-    order_items: list[OrderItem] = []
-
-    for line in payload.lines:
-        item = get_item_by_item_number(db, line.item_number)
-        if not item:
-            raise HTTPException(
-                status_code=404, detail=f"Item not found: {line.item_number}"
-            )
-        qty_in_stock = int(getattr(item, "qty_in_stock"))
-        if qty_in_stock < line.quantity:
-            raise HTTPException(
-                status_code=400, detail=f"Not enough stock for {item.item_number}"
-            )
-
-        unit_price = float(getattr(item, "price"))
-        line_total = unit_price * line.quantity
-        subtotal += line_total
-
-        # decrement stock
-        setattr(item, "qty_in_stock", qty_in_stock - line.quantity)
-
-        order_items.append(
-            OrderItem(
-                item_number=item.item_number,
-                name=item.name,
-                unit_price=unit_price,
-                quantity=line.quantity,
-                line_total=line_total,
-            )
-        )
-
-    tax = round(subtotal * TAX_RATE, 2)
-    total = round(subtotal + tax, 2)
-
-    order = Order(
-        user_id=user.id,
-        status="in_progress",
-        subtotal=subtotal,
-        tax=tax,
-        total=total,
-        items=order_items,
-    )
-
-    db.add(order)
-    db.commit()
-    db.refresh(order)
-    return order
+    return await run_db(db, place_order, user.id, payload.lines)
 
 
 @router.get("/me", response_model=list[OrderRead])
-def list_my_orders(
-    db: Session = Depends(get_db),
+async def list_my_orders(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    status_value: str | None = Query(None, alias="status"),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    db=Depends(get_db),
     user: UserRead = Depends(get_current_user),
 ):
     require_shop(user)
-    return (
-        db.query(Order).filter(Order.user_id == user.id).order_by(Order.id.desc()).all()
-    )
+    etag = await run_db(db, etag_for, user_orders(user.id))
+    cached = not_modified(request, etag, ORDERS_CACHE_CONTROL)
+    if cached:
+        return cached
+
+    try:
+        orders, next_cursor = await run_db(
+            db,
+            list_order_records,
+            limit=limit,
+            cursor=cursor,
+            user_id=user.id,
+            status=status_value,
+            created_from=created_from,
+            created_to=created_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response = FastJSONResponse(orders)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    set_etag(response, etag, ORDERS_CACHE_CONTROL)
+    return response
 
 
 @router.get("/", response_model=list[OrderRead])
-def list_all_orders(
-    db: Session = Depends(get_db),
+async def list_all_orders(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    status_value: str | None = Query(None, alias="status"),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    user_id: int | None = None,
+    db=Depends(get_db),
     user: UserRead = Depends(get_current_user),
 ):
     require_admin(user)
-    return db.query(Order).order_by(Order.id.desc()).all()
+    etag = await run_db(db, etag_for, ALL_ORDERS)
+    cached = not_modified(request, etag, ORDERS_CACHE_CONTROL)
+    if cached:
+        return cached
+
+    try:
+        orders, next_cursor = await run_db(
+            db,
+            list_order_records,
+            limit=limit,
+            cursor=cursor,
+            user_id=user_id,
+            status=status_value,
+            created_from=created_from,
+            created_to=created_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response = FastJSONResponse(orders)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    set_etag(response, etag, ORDERS_CACHE_CONTROL)
+    return response
 
 
 @router.put("/{order_id}/status", response_model=OrderRead)
-def set_order_status(
+async def set_order_status(
     order_id: int,
     status_value: str,
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
     user: UserRead = Depends(get_current_user),
 ):
     require_admin(user)
 
     status_value = status_value.strip().lower()
-    if status_value not in ("in_progress", "shipped", "complete"):
+    if status_value not in ORDER_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status")
 
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = await run_db(db, set_order_status_in_db, order_id, status_value)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-
-    setattr(order, "status", status_value)
-    db.commit()
-    db.refresh(order)
     return order
@@ -2,6 +2,8 @@ from fastapi import APIRouter
 from app.api.v1 import users, auth
 from app.api.v1 import items
 from app.api.v1 import orders
+from app.api.v1 import events
+from app.api.v1 import analytics
 
 
 router = APIRouter()
@@ -9,3 +11,7 @@ router.include_router(auth.router, prefix="/auth", tags=["Auth"])
 router.include_router(users.router, prefix="/users", tags=["Users"])
 router.include_router(items.router, prefix="/items", tags=["items"])
 router.include_router(orders.router, prefix="/orders", tags=["orders"])
+router.include_router(events.router, prefix="/events", tags=["events"])
+router.include_router(
+    analytics.router, prefix="/admin/analytics", tags=["analytics"]
+)
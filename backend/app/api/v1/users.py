@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
 from app.api.deps_auth import get_current_user
-from app.models.user import User
-from app.db.deps import get_db
+from app.core.auth_cache import Principal
+from app.core.security import hash_password_async
+from app.db.deps import get_db, run_db
 from app.schemas.user import UserCreate, UserRead, UserMe
 from app.services.user_service import create_user, get_users, delete_user
 from app.api.deps_roles import require_role
@@ -12,33 +12,36 @@ router = APIRouter()
 
 
 @router.post("/", response_model=UserRead)
-def create_user_endpoint(user_in: UserCreate, db: Session = Depends(get_db)):
-    return create_user(db, user_in)
+async def create_user_endpoint(user_in: UserCreate, db=Depends(get_db)):
+    hashed_password = await hash_password_async(user_in.password)
+    return await run_db(db, create_user, user_in, hashed_password)
 
 
 @router.get("/me", response_model=UserMe)
-def read_me(current_user: User = Depends(get_current_user)):
+async def read_me(current_user: Principal = Depends(get_current_user)):
     return current_user
 
 
 @router.get("/", response_model=list[UserRead])
-def list_users(
+async def list_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
     include_deleted: bool = False,
-    db: Session = Depends(get_db),
+    db=Depends(get_db),
 ):
-    return get_users(db, skip=skip, limit=limit, include_deleted=include_deleted)
+    return await run_db(
+        db, get_users, skip=skip, limit=limit, include_deleted=include_deleted
+    )
 
 
 @router.delete("/{user_id}", response_model=dict)
-def delete_user_endpoint(user_id: int, db: Session = Depends(get_db)):
-    ok = delete_user(db, user_id)
+async def delete_user_endpoint(user_id: int, db=Depends(get_db)):
+    ok = await run_db(db, delete_user, user_id)
     if not ok:
         raise HTTPException(status_code=404, detail="User not found")
     return {"ok": True}
 
 
 @router.get("/admin-only")
-def admin_only(user: User = Depends(require_role("admin"))):
+async def admin_only(user: Principal = Depends(require_role("admin"))):
     return {"ok": True}
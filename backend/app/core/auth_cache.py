@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Hashable
+
+from app.core.config import (
+    PRINCIPAL_CACHE_MAX_ENTRIES,
+    PRINCIPAL_CACHE_TTL_SECONDS,
+    USER_CHANGES_POLL_SECONDS,
+)
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """What request handlers need to know about the authenticated user."""
+
+    id: int
+    email: str
+    full_name: str
+    role: str
+
+
+# token -> email, for tokens whose signature and expiry were already checked
+token_cache = TTLCache(PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_TTL_SECONDS)
+# email -> Principal, for users that are not deleted
+principal_cache = TTLCache(PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_TTL_SECONDS)
+
+# Bumped on every invalidation so a lookup that raced with a user change
+# does not put the stale row back into the cache.
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def current_generation() -> int:
+    return _generation
+
+
+def cache_principal(principal: Principal, generation: int) -> None:
+    with _generation_lock:
+        if generation == _generation:
+            principal_cache.set(principal.email, principal)
+
+
+def invalidate_user(email: str) -> None:
+    """Drop the cached principal for email; call after committing a user change."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        principal_cache.pop(email)
+
+
+# invalidate_user() only reaches this process. Changes made elsewhere are
+# found through users.updated_at: every USER_CHANGES_POLL_SECONDS one
+# request looks for users changed since the previous look and drops them.
+# The look back overlaps a little for commits in flight and clock skew.
+_USER_CHANGES_OVERLAP = timedelta(seconds=5)
+_changes_lock = threading.Lock()
+_changes_polled_at = 0.0
+_changes_since = datetime.utcnow()
+
+
+def claim_user_changes_poll() -> datetime | None:
+    """When a poll is due, claim it and return the time to look back to."""
+    global _changes_polled_at, _changes_since
+    if USER_CHANGES_POLL_SECONDS <= 0 or principal_cache.ttl <= 0:
+        return None
+    now = time.monotonic()
+    with _changes_lock:
+        if now - _changes_polled_at < USER_CHANGES_POLL_SECONDS:
+            return None
+        _changes_polled_at = now
+        since, _changes_since = _changes_since, datetime.utcnow()
+    return since - _USER_CHANGES_OVERLAP
+
+
+def cache_stats() -> dict:
+    return {"tokens": token_cache.stats(), "principals": principal_cache.stats()}
@@ -5,3 +5,109 @@ SECRET_KEY = os.getenv(
 )
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+
+# Authenticated-principal cache (app/core/auth_cache.py); TTL 0 disables it
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+# How often each worker asks the database for users changed by other
+# processes (other workers, app.scripts); 0 turns this off
+USER_CHANGES_POLL_SECONDS = float(os.getenv("USER_CHANGES_POLL_SECONDS", "2"))
+
+# bcrypt runs in a process pool (app/core/security.py); 0 workers falls back
+# to the threadpool. Requests beyond MAX_PENDING get a 503.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+
+# "sync": SQLAlchemy Session, DB calls run in the threadpool.
+# "async": AsyncSession on aiosqlite/asyncpg, DB calls awaited on the event loop.
+DB_MODE = os.getenv("DB_MODE", "sync").strip().lower()
+
+# Connection pool (ignored for in-memory SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# SQLite connection pragmas
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KIB = int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Item image uploads
+UPLOADS_DIR = "app/static/uploads"  # served under /static/uploads
+# Partial files while an upload or derivative is being written: outside
+# app/static so they are never served, on the same filesystem as
+# UPLOADS_DIR so finished files can be renamed into place
+UPLOADS_TMP_DIR = "app/uploads-tmp"
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+# Resized image derivatives (app/services/image_service.py)
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "1"))
+# Bigger images get no derivatives (the original is served): decoding a
+# small file with huge dimensions would otherwise exhaust a worker's memory
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", str(40_000_000)))
+
+# ETag / If-None-Match on item and order lists (app/core/versions.py). The
+# change counters are in the database, so any number of workers can serve them.
+CONDITIONAL_GET = os.getenv("CONDITIONAL_GET", "true").lower() in ("1", "true", "yes")
+
+# Server-sent events (app/core/events.py): recent events kept for
+# Last-Event-ID resume, and how far a subscriber may fall behind before it
+# is disconnected
+EVENTS_REPLAY_SIZE = int(os.getenv("EVENTS_REPLAY_SIZE", "1000"))
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+
+# Bulk catalog import/export (app/services/catalog_service.py)
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "1000"))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Most entries accepted by one PATCH /items/batch request
+ITEM_BATCH_MAX = int(os.getenv("ITEM_BATCH_MAX", "10000"))
+
+# Upper bound for PUT /items/{item_number}/stock-shards
+STOCK_SHARDS_MAX = int(os.getenv("STOCK_SHARDS_MAX", "64"))
+
+# Orders per transaction when app.scripts.rebuild_sales_rollups recomputes
+# the sales rollups from history
+ROLLUP_REBUILD_CHUNK = int(os.getenv("ROLLUP_REBUILD_CHUNK", "5000"))
+
+# Reorder suggestions (app/services/reorder_service.py): days of sales
+# history to use (at least 28), supplier lead time, days of sales a reorder
+# should cover on top of the reorder point, and the safety stock z-score
+# (1.65 ~ 95% chance of not running out during the lead time)
+REORDER_HISTORY_DAYS = int(os.getenv("REORDER_HISTORY_DAYS", "56"))
+REORDER_LEAD_TIME_DAYS = float(os.getenv("REORDER_LEAD_TIME_DAYS", "7"))
+REORDER_REVIEW_DAYS = float(os.getenv("REORDER_REVIEW_DAYS", "14"))
+REORDER_SERVICE_Z = float(os.getenv("REORDER_SERVICE_Z", "1.65"))
+# Rollup rows fetched per chunk while loading history
+REORDER_CHUNK_SIZE = int(os.getenv("REORDER_CHUNK_SIZE", "50000"))
+
+# Prometheus metrics at GET /metrics (app/core/metrics.py). Off unless
+# METRICS_TOKEN is set, so they are never public; scrapers send
+# "Authorization: Bearer <token>". METRICS_ENABLED=false turns them off anyway.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_ENABLED = bool(METRICS_TOKEN) and os.getenv(
+    "METRICS_ENABLED", "true"
+).lower() in ("1", "true", "yes")
+
+# Debug-only response details, e.g. the SQL profiler's Server-Timing header
+DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+
+# SQL profiler (app/core/sql_profiler.py), off by default: logs statements
+# slower than SLOW_QUERY_MS and, per request, statement shapes run at least
+# N_PLUS_ONE_THRESHOLD times. SLOW_QUERY_LOG_FILE also writes them to a file.
+SQL_PROFILER = os.getenv("SQL_PROFILER", "false").lower() in ("1", "true", "yes")
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE", "")
+
+# Rows per chunk file (and per restore transaction) in app.scripts.snapshot
+SNAPSHOT_CHUNK_SIZE = int(os.getenv("SNAPSHOT_CHUNK_SIZE", "50000"))
+
+# Refuse to start unless the database is at the Alembic head revision
+# (app/db/migrations.py). Tables are never created at startup.
+SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "true").lower() in ("1", "true", "yes")
@@ -0,0 +1,136 @@
+import asyncio
+import secrets
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import EVENTS_QUEUE_SIZE, EVENTS_REPLAY_SIZE
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    id: int
+    type: str
+    data: dict[str, Any]
+    # None: everyone; otherwise only that user and admins
+    user_id: int | None = None
+
+
+class Subscriber:
+    __slots__ = ("user_id", "is_admin", "queue", "evicted")
+
+    def __init__(self, user_id: int, is_admin: bool, maxsize: int):
+        self.user_id = user_id
+        self.is_admin = is_admin
+        # None is the end-of-stream marker put there on eviction
+        self.queue: asyncio.Queue[Event | None] = asyncio.Queue(maxsize)
+        self.evicted = False
+
+    def wants(self, event: Event) -> bool:
+        return event.user_id is None or self.is_admin or event.user_id == self.user_id
+
+
+class EventHub:
+    """In-process pub/sub for server-sent events.
+
+    publish() may be called from any thread (service functions run in the
+    threadpool); delivery happens on the event loop the subscribers live on.
+    Each subscriber has a bounded queue, and one that falls behind is
+    disconnected rather than buffered without limit. It can then reconnect
+    with Last-Event-ID and pick up from the replay buffer.
+    """
+
+    def __init__(self, replay_size: int, queue_size: int):
+        self.queue_size = queue_size
+        self.evictions = 0
+        # Event ids restart on every boot; the prefix tells ids apart
+        self._boot_id = secrets.token_hex(4)
+        self._next_id = 1
+        self._replay: deque[Event] = deque(maxlen=replay_size)
+        self._subscribers: set[Subscriber] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    def event_id(self, event: Event) -> str:
+        return f"{self._boot_id}-{event.id}"
+
+    def publish(self, type: str, data: dict[str, Any], user_id: int | None = None) -> None:
+        """Queue an event; call only after the change it reports is committed."""
+        with self._lock:
+            event = Event(self._next_id, type, data, user_id)
+            self._next_id += 1
+            self._replay.append(event)
+            loop = self._loop if self._subscribers else None
+
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._dispatch, event)
+            except RuntimeError:
+                # loop already closed (shutdown); nobody is listening
+                pass
+
+    def _dispatch(self, event: Event) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            if sub.evicted or not sub.wants(event):
+                continue
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._evict(sub)
+
+    def _evict(self, sub: Subscriber) -> None:
+        sub.evicted = True
+        self.unsubscribe(sub)
+        self.evictions += 1
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(None)
+
+    def subscribe(
+        self, user_id: int, is_admin: bool, last_event_id: str | None = None
+    ) -> tuple[Subscriber, list[Event] | None]:
+        """Register a subscriber; must be called on the event loop.
+
+        Also returns the missed events after last_event_id, or None when they
+        can no longer be replayed (too old, or from before a restart) and the
+        client has to refetch its state.
+        """
+        sub = Subscriber(user_id, is_admin, self.queue_size)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.add(sub)
+            backlog = self._replay_after(last_event_id) if last_event_id else []
+        if backlog:
+            backlog = [event for event in backlog if sub.wants(event)]
+        return sub, backlog
+
+    def _replay_after(self, last_event_id: str) -> list[Event] | None:
+        boot_id, _, seq = last_event_id.partition("-")
+        if boot_id != self._boot_id or not seq.isdigit():
+            return None
+        last = int(seq)
+        if last >= self._next_id:
+            return None
+        oldest = self._replay[0].id if self._replay else self._next_id
+        if last < oldest - 1:
+            return None
+        return [event for event in self._replay if event.id > last]
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "buffered": len(self._replay),
+                "last_id": self._next_id - 1,
+                "evictions": self.evictions,
+            }
+
+
+event_hub = EventHub(EVENTS_REPLAY_SIZE, EVENTS_QUEUE_SIZE)
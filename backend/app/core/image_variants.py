@@ -0,0 +1,35 @@
+import posixpath
+
+# name -> longest edge in pixels
+IMAGE_VARIANT_SIZES = {"thumb": 160, "card": 480, "detail": 1200}
+IMAGE_VARIANT_FORMATS = ("webp", "jpg")
+
+UPLOADS_URL_PREFIX = "/static/uploads/"
+
+
+def variant_filename(source_filename: str, variant: str, fmt: str) -> str:
+    stem = posixpath.splitext(source_filename)[0]
+    return f"{stem}-{variant}.{fmt}"
+
+
+def is_variant_filename(filename: str) -> bool:
+    stem, ext = posixpath.splitext(filename)
+    return ext[1:] in IMAGE_VARIANT_FORMATS and any(
+        stem.endswith(f"-{variant}") for variant in IMAGE_VARIANT_SIZES
+    )
+
+
+def variant_urls(image_url: str | None) -> dict[str, dict[str, str]] | None:
+    """URLs of the derivatives generated for an uploaded image.
+
+    Derived from the name alone, so listing items costs no disk access.
+    """
+    if not image_url or not image_url.startswith(UPLOADS_URL_PREFIX):
+        return None
+    # Same names as variant_filename, with the stem split off only once;
+    # this runs for every item in every list response
+    stem = posixpath.splitext(image_url)[0]
+    return {
+        variant: {fmt: f"{stem}-{variant}.{fmt}" for fmt in IMAGE_VARIANT_FORMATS}
+        for variant in IMAGE_VARIANT_SIZES
+    }
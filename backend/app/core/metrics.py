@@ -0,0 +1,366 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Iterable
+
+from anyio.to_thread import current_default_thread_limiter
+from sqlalchemy import event
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Prometheus text format, written by hand: a handful of counters, gauges and
+# histograms is all the API needs, and recording one value is a dict lookup
+# and a few additions under a lock.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type}"
+        yield from self._samples()
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+
+class Gauge(_Metric):
+    """A gauge set by the code, or read from callback at scrape time.
+
+    callback returns the value, or for a labelled gauge a dict mapping
+    label tuples to values.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        callback: Callable[[], float | dict[tuple, float]] | None = None,
+    ):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+        self._callback = callback
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def _samples(self) -> Iterable[str]:
+        if self._callback is not None:
+            value = self._callback()
+            values = list(value.items()) if isinstance(value, dict) else [((), value)]
+        else:
+            with self._lock:
+                values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (last one: +Inf)..., sum]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 1) + [0]
+            counts[i] += 1
+            counts[-1] += value
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = [(labels, list(counts)) for labels, counts in self._values.items()]
+        names = self.label_names
+        for labels, counts in values:
+            total = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                total += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(names, labels, le)} {total}"
+            yield f"{self.name}_sum{_labels(names, labels)} {_number(counts[-1])}"
+            yield f"{self.name}_count{_labels(names, labels)} {total}"
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in _registry for line in metric.render()) + "\n"
+
+
+# --- HTTP
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the end of the response body",
+    ("method", "route"),
+)
+REQUESTS = Counter(
+    "http_requests_total", "Finished requests", ("method", "route", "status")
+)
+# Per method only: the route is not known until the request is routed
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being handled", ("method",))
+
+# --- SQL (through engine events, see instrument_engine)
+
+SQL_SECONDS = Histogram(
+    "db_statement_duration_seconds", "Duration of one SQL statement", (), SQL_BUCKETS
+)
+SQL_PER_REQUEST = Histogram(
+    "db_statements_per_request",
+    "SQL statements executed while handling one request",
+    ("route",),
+    COUNT_BUCKETS,
+)
+SQL_SECONDS_PER_REQUEST = Histogram(
+    "db_seconds_per_request",
+    "Time spent in SQL statements while handling one request",
+    ("route",),
+    SQL_BUCKETS + (2.5, 5.0),
+)
+
+# --- auth and checkout
+
+PASSWORD_VERIFY_SECONDS = Histogram(
+    "password_verify_duration_seconds",
+    "bcrypt verification including the wait for a hashing worker",
+    (),
+    (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+)
+CHECKOUTS = Counter(
+    "checkouts_total",
+    "Checkouts by outcome (success, out_of_stock, not_found, empty_cart)",
+    ("outcome",),
+)
+
+# --- startup (app/main.py)
+
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds", "Time spent starting this process, by phase", ("phase",)
+)
+
+# --- read at scrape time
+
+
+# app modules are imported inside the callbacks: they import this one
+
+
+def _threadpool() -> dict[tuple, float]:
+    # Must run on the event loop: the limiter is per loop
+    limiter = current_default_thread_limiter()
+    return {
+        ("in_use",): limiter.borrowed_tokens,
+        ("limit",): limiter.total_tokens,
+        ("waiting",): limiter.statistics().tasks_waiting,
+    }
+
+
+def _db_pools() -> dict[tuple, float]:
+    from app.db.pool import pool_status
+    from app.db.session import async_engine, engine
+
+    values = {}
+    for name, eng in (("sync", engine), ("async", async_engine)):
+        status = pool_status(eng) if eng is not None else None
+        if status is not None:
+            values[name, "checked_out"] = status["checked_out"]
+            values[name, "size"] = status["size"]
+            values[name, "overflow"] = status["overflow"]
+    return values
+
+
+def _password_jobs() -> float:
+    from app.core.security import pending_password_jobs
+
+    return pending_password_jobs()
+
+
+def _event_subscribers() -> float:
+    from app.core.events import event_hub
+
+    return event_hub.stats()["subscribers"]
+
+
+Gauge(
+    "threadpool_threads",
+    "Worker threads for sync endpoints and DB calls (in_use, limit, waiting)",
+    ("state",),
+    _threadpool,
+)
+Gauge(
+    "db_pool_connections",
+    "Connection pool occupancy per engine",
+    ("engine", "state"),
+    _db_pools,
+)
+Gauge(
+    "password_jobs_pending",
+    "bcrypt jobs queued or running; 503 past PASSWORD_HASH_MAX_PENDING",
+    (),
+    _password_jobs,
+)
+Gauge("event_stream_subscribers", "Open /api/v1/events streams", (), _event_subscribers)
+
+# [statements, seconds] of the request being handled, if any
+_request_sql: ContextVar[list | None] = ContextVar("request_sql", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    started = conn.info["metrics_started"].pop()
+    elapsed = time.perf_counter() - started
+    SQL_SECONDS.observe(elapsed)
+    totals = _request_sql.get()
+    if totals is not None:
+        totals[0] += 1
+        totals[1] += elapsed
+
+
+def _handle_error(context):
+    # after_cursor_execute does not run for a failed statement
+    if context.connection is not None:
+        started = context.connection.info.get("metrics_started")
+        if started:
+            started.pop()
+
+
+def instrument_engine(engine) -> None:
+    """Time every statement run through engine (pass a sync Engine; for an
+    AsyncEngine use its .sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route as a template, e.g. /api/v1/items/{item_number}.
+
+    Rebuilt from the request path and its path parameters once routing is
+    done; FastAPI keeps the prefixes of included routers to itself.
+    """
+    if "endpoint" not in scope:
+        return "unmatched"
+    if "route" not in scope:
+        # A mounted app (static files): name it by its mount point
+        return f"{scope.get('root_path', '')}/{{path}}"
+    template = scope["path"]
+    for name, value in reversed(list(scope.get("path_params", {}).items())):
+        segment = f"/{value}"
+        end = len(template)
+        while (i := template.rfind(segment, 0, end)) >= 0:
+            after = i + len(segment)
+            if after == len(template) or template[after] == "/":
+                template = f"{template[:i]}/{{{name}}}{template[after:]}"
+                break
+            end = i
+    return template
+
+
+class MetricsMiddleware:
+    """Records request latency, status and SQL work per route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        totals = [0, 0.0]
+        token = _request_sql.set(totals)
+        IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_template(scope)
+            REQUEST_SECONDS.observe(time.perf_counter() - started, method, route)
+            REQUESTS.inc(method, route, status)
+            IN_FLIGHT.dec(method)
+            SQL_PER_REQUEST.observe(totals[0], route)
+            SQL_SECONDS_PER_REQUEST.observe(totals[1], route)
+            _request_sql.reset(token)
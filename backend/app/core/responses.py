@@ -0,0 +1,16 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson.
+
+    Serializes dataclasses, datetimes and plain containers natively. Returning
+    it from an endpoint bypasses response_model validation, so only hand it
+    data already in the declared wire shape (see app/schemas/records.py).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
@@ -1,16 +1,117 @@
-from passlib.context import CryptContext
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+from app.core.metrics import PASSWORD_VERIFY_SECONDS
 
 
-def hash_password(password: str) -> str:
+@lru_cache(maxsize=1)
+def pwd_context():
+    # passlib and bcrypt load on first use, not at import
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _check_length(password: str) -> None:
     if len(password.encode("utf-8")) > 72:
         raise HTTPException(
             status_code=422, detail="Password must be 72 bytes or fewer"
         )
-    return pwd_context.hash(password)
+
+
+def hash_password(password: str) -> str:
+    _check_length(password)
+    return pwd_context().hash(password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(password, hashed_password)
+    return pwd_context().verify(password, hashed_password)
+
+
+# --- async callers: bcrypt off the event loop and off the request threadpool
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn, not fork: the API process already runs threads
+            _executor = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _discard_executor(broken: ProcessPoolExecutor) -> None:
+    # A worker that died (OOM kill, crash) breaks the whole pool for good;
+    # the next _get_executor() starts a fresh one
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_password_hasher() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def _run_password_job(fn, *args):
+    global _pending
+    with _pending_lock:
+        if _pending >= PASSWORD_HASH_MAX_PENDING:
+            raise HTTPException(
+                status_code=503,
+                detail="Server busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        _pending += 1
+    try:
+        if PASSWORD_HASH_WORKERS <= 0:
+            return await run_in_threadpool(fn, *args)
+        loop = asyncio.get_running_loop()
+        executor = _get_executor()
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            _discard_executor(executor)
+            return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+def pending_password_jobs() -> int:
+    return _pending
+
+
+async def hash_password_async(password: str) -> str:
+    _check_length(password)
+    return await _run_password_job(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    started = time.perf_counter()
+    try:
+        return await _run_password_job(verify_password, password, hashed_password)
+    finally:
+        PASSWORD_VERIFY_SECONDS.observe(time.perf_counter() - started)
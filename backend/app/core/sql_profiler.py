@@ -0,0 +1,178 @@
+import logging
+import os
+import re
+import sys
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+
+import orjson
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import N_PLUS_ONE_THRESHOLD, SLOW_QUERY_LOG_FILE, SLOW_QUERY_MS
+from app.core.metrics import route_template
+
+# Opt-in SQL profiler (SQL_PROFILER=true): counts and times every statement
+# per request, logs slow statements and statement shapes repeated often
+# enough to be an N+1 pattern, and in DEBUG adds a Server-Timing header.
+# Log lines are JSON on the "app.sql" logger.
+
+logger = logging.getLogger("app.sql")
+if SLOW_QUERY_LOG_FILE:
+    _handler = logging.FileHandler(SLOW_QUERY_LOG_FILE)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+
+_SERVICES_DIR = os.path.join("app", "services", "")
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\?|%\(\w+\)s|%s|\$\d+|(?<!:):\w+")
+_LIST = re.compile(r"\(\?(?:, \?)+\)")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement: str) -> str:
+    """Statement shape: literals and placeholders become ?, and IN lists of
+    any length look the same."""
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _PLACEHOLDER.sub("?", _LITERAL.sub("?", sql))
+    return _LIST.sub("(?...)", sql)
+
+
+def _caller() -> str | None:
+    """The innermost app/services function on the stack, if any."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if _SERVICES_DIR in code.co_filename:
+            module = frame.f_globals.get("__name__", "?")
+            return f"{module}.{code.co_qualname}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+
+class RequestProfile:
+    __slots__ = ("scope", "count", "seconds", "shapes")
+
+    def __init__(self, scope: Scope | None = None):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        # shape -> [count, seconds, caller of the first one]
+        self.shapes: dict[str, list] = {}
+
+
+_profile: ContextVar[RequestProfile | None] = ContextVar("sql_profile", default=None)
+
+
+def _log(event_name: str, **fields) -> None:
+    logger.warning(orjson.dumps({"event": event_name, **fields}).decode())
+
+
+def _route(profile: RequestProfile | None) -> str | None:
+    if profile is None or profile.scope is None:
+        return None
+    return f"{profile.scope['method']} {route_template(profile.scope)}"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    elapsed = time.perf_counter() - conn.info["profiler_started"].pop()
+    profile = _profile.get()
+    shape = None
+    caller = None
+
+    if profile is not None:
+        profile.count += 1
+        profile.seconds += elapsed
+        shape = normalize_sql(statement)
+        seen = profile.shapes.get(shape)
+        if seen is None:
+            caller = _caller()
+            profile.shapes[shape] = [1, elapsed, caller]
+        else:
+            seen[0] += 1
+            seen[1] += elapsed
+            caller = seen[2]
+
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        _log(
+            "slow_query",
+            ms=round(elapsed * 1000, 2),
+            sql=shape or normalize_sql(statement),
+            caller=caller or _caller(),
+            route=_route(profile),
+            executemany=many,
+        )
+
+
+def _handle_error(context):
+    if context.connection is not None:
+        started = context.connection.info.get("profiler_started")
+        if started:
+            started.pop()
+
+
+def instrument_engine(engine) -> None:
+    """Profile statements run through engine (a sync Engine; for an
+    AsyncEngine pass its .sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def report_repeats(profile: RequestProfile) -> list[dict]:
+    """Statement shapes run at least N_PLUS_ONE_THRESHOLD times."""
+    return [
+        {"sql": shape, "count": count, "ms": round(seconds * 1000, 2), "caller": caller}
+        for shape, (count, seconds, caller) in profile.shapes.items()
+        if count >= N_PLUS_ONE_THRESHOLD
+    ]
+
+
+class SqlProfilerMiddleware:
+    """Per-request SQL profile; see the top of this file."""
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope)
+        token = _profile.set(profile)
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.server_timing:
+                headers = MutableHeaders(scope=message)
+                app_ms = (time.perf_counter() - started) * 1000
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={profile.seconds * 1000:.2f};desc="{profile.count} '
+                    f'queries", app;dur={app_ms:.2f}',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _profile.reset(token)
+            repeats = report_repeats(profile)
+            if repeats:
+                _log(
+                    "n_plus_one",
+                    route=_route(profile),
+                    statements=profile.count,
+                    db_ms=round(profile.seconds * 1000, 2),
+                    repeated=repeats,
+                )
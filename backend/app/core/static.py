@@ -0,0 +1,123 @@
+import gzip
+import hashlib
+import stat
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Callable
+
+import anyio
+from fastapi import Request
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Checked in preference order; siblings are produced by the frontend build
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(header: str) -> set[str]:
+    encodings = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if name:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with a Cache-Control policy and optional .br/.gz siblings."""
+
+    def __init__(
+        self,
+        *args,
+        cache_control: Callable[[str], str] = lambda path: REVALIDATE,
+        precompressed: bool = False,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+        self.precompressed = precompressed
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = None
+        if self.precompressed and scope["method"] in ("GET", "HEAD"):
+            response = await self._precompressed_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if response.status_code in (200, 206, 304):
+            response.headers["Cache-Control"] = self.cache_control(path)
+            if self.precompressed:
+                response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    async def _precompressed_response(self, path: str, scope: Scope) -> Response | None:
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in PRECOMPRESSED:
+            if encoding not in accepted:
+                continue
+            try:
+                full_path, stat_result = await anyio.to_thread.run_sync(
+                    self.lookup_path, path + suffix
+                )
+            except (OSError, ValueError):
+                return None
+            if not (stat_result and stat.S_ISREG(stat_result.st_mode)):
+                continue
+
+            response = FileResponse(
+                full_path,
+                stat_result=stat_result,
+                media_type=guess_type(path)[0] or "text/plain",
+                headers={"Content-Encoding": encoding},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                return NotModifiedResponse(response.headers)
+            return response
+        return None
+
+
+class CachedIndexHtml:
+    """The SPA shell, read once and answered from memory with an ETag."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._body: bytes | None = None
+        self._gzipped: bytes | None = None
+        self._etag = ""
+
+    def _load(self) -> bool:
+        if self._body is None:
+            if not self.path.exists():
+                return False
+            body = self.path.read_bytes()
+            self._gzipped = gzip.compress(body, compresslevel=9)
+            self._etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+            self._body = body
+        return True
+
+    def response(self, request: Request) -> Response | None:
+        if not self._load():
+            return None
+
+        headers = {
+            "ETag": self._etag,
+            "Cache-Control": REVALIDATE,
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = request.headers.get("if-none-match", "")
+        if self._etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+
+        if "gzip" in accepted_encodings(request.headers.get("accept-encoding", "")):
+            headers["Content-Encoding"] = "gzip"
+            return Response(self._gzipped, media_type="text/html", headers=headers)
+        return Response(self._body, media_type="text/html", headers=headers)
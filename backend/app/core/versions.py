@@ -0,0 +1,98 @@
+from fastapi import Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import CONDITIONAL_GET
+from app.models.change_version import ChangeVersion
+
+CATALOG = "catalog"
+ALL_ORDERS = "orders"
+
+
+def user_orders(user_id: int) -> str:
+    return f"orders:{user_id}"
+
+
+# The counters live in the change_versions table, so writes made by any
+# worker or script invalidate the ETags every worker hands out. A key with
+# no row yet is at version 0.
+_table = ChangeVersion.__table__
+_UPSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def current_version(db: Session, key: str) -> int:
+    return db.scalar(select(_table.c.version).where(_table.c.key == key)) or 0
+
+
+def bump(db: Session, *keys: str) -> None:
+    """Mark keys as changed, in the caller's transaction.
+
+    Call it last, right before the commit: the counter row stays locked
+    until then, and every writer of a key waits on it.
+    """
+    # Sorted, so writers bumping several keys lock them in the same order
+    for key in sorted(set(keys)):
+        result = db.execute(
+            update(_table)
+            .where(_table.c.key == key)
+            .values(version=_table.c.version + 1)
+        )
+        if result.rowcount:
+            continue
+        insert_fn = _UPSERTS.get(db.get_bind().dialect.name)
+        if insert_fn is None:
+            db.execute(_table.insert().values(key=key, version=1))
+            continue
+        # Another writer may create the row first
+        db.execute(
+            insert_fn(_table)
+            .values(key=key, version=1)
+            .on_conflict_do_update(
+                index_elements=[_table.c.key],
+                set_={"version": _table.c.version + 1},
+            )
+        )
+
+
+def bump_all(db: Session, *keys: str) -> None:
+    """Mark every key that has a row as changed, plus keys (for restores)."""
+    db.execute(update(_table).values(version=_table.c.version + 1))
+    existing = set(db.scalars(select(_table.c.key).where(_table.c.key.in_(keys))))
+    missing = sorted(set(keys) - existing)
+    if missing:
+        db.execute(_table.insert(), [{"key": k, "version": 1} for k in missing])
+
+
+def etag_for(db: Session, key: str) -> str:
+    if not CONDITIONAL_GET:
+        # Never sent; skip the lookup
+        return ""
+    return f'W/"{key}-{current_version(db, key)}"'
+
+
+def not_modified(request: Request, etag: str, cache_control: str) -> Response | None:
+    """Return a 304 when the client already holds etag, otherwise None.
+
+    Read the ETag before querying: a write that commits in between then
+    only causes one extra full response, never a stale 304.
+    """
+    if not CONDITIONAL_GET:
+        return None
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(
+            status_code=304, headers={"ETag": etag, "Cache-Control": cache_control}
+        )
+    return None
+
+
+def set_etag(response: Response, etag: str, cache_control: str) -> None:
+    if CONDITIONAL_GET:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = cache_control
@@ -4,5 +4,9 @@ from app.db.base_class import Base  # noqa: F401
 # Import models so they register with Base.metadata
 from app.models.user import User  # noqa: F401
 from app.models.item import Item  # noqa: F401
+from app.models.item_stock_shard import ItemStockShard  # noqa: F401
 from app.models.order import Order  # noqa: F401
 from app.models.order_item import OrderItem  # noqa: F401
+from app.models.refresh_token import RefreshToken  # noqa: F401
+from app.models.sales_rollup import SalesDaily  # noqa: F401
+from app.models.change_version import ChangeVersion  # noqa: F401
@@ -1,11 +1,58 @@
-from typing import Generator
+from typing import AsyncGenerator, AsyncIterator, Callable, Generator, Iterator, TypeVar
+from sqlalchemy import Executable, Row
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from app.core.config import DB_MODE
+from app.db.session import AsyncSessionLocal, SessionLocal
 
+T = TypeVar("T")
 
-def get_db() -> Generator[Session, None, None]:
+
+def get_sync_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Chosen once at startup from DB_MODE; endpoints only ever see get_db
+get_db = get_async_db if DB_MODE == "async" else get_sync_db
+
+
+async def run_db(db, fn: Callable[..., T], *args, **kwargs) -> T:
+    """Call a sync service function fn(session, *args, **kwargs) from an
+    async endpoint without blocking the event loop.
+
+    With an AsyncSession the function runs through run_sync, so its
+    queries are awaited on the async driver and no thread is held while
+    waiting on the database. With a plain Session it runs in the
+    threadpool, as sync endpoints always did.
+    """
+    if isinstance(db, Session):
+        return await run_in_threadpool(fn, db, *args, **kwargs)
+    return await db.run_sync(fn, *args, **kwargs)
+
+
+def _partitions(db: Session, stmt: Executable) -> Iterator[list[Row]]:
+    yield from db.execute(stmt).partitions()
+
+
+async def stream_partitions(db, stmt: Executable) -> AsyncIterator[list[Row]]:
+    """Iterate the rows of stmt in lists of its yield_per size.
+
+    Meant for streaming responses: only one partition is in memory at a
+    time, and with a plain Session each fetch runs in the threadpool.
+    """
+    if isinstance(db, Session):
+        async for rows in iterate_in_threadpool(_partitions(db, stmt)):
+            yield rows
+    else:
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            yield rows
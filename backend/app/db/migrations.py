@@ -0,0 +1,92 @@
+import re
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+# The API never creates or alters tables itself: the schema belongs to
+# Alembic (alembic upgrade head). At startup it only checks that the
+# database is at the newest revision, and refuses to start otherwise.
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+ALEMBIC_INI = BACKEND_DIR / "alembic.ini"
+VERSIONS_DIR = BACKEND_DIR / "alembic" / "versions"
+
+# Read from the migration files as text: loading them through Alembic
+# imports every one of them and costs more than the rest of the check
+_REVISION = re.compile(r"^revision(?::[^=]*)?=\s*['\"](\w+)['\"]", re.M)
+_DOWN_REVISION = re.compile(r"^down_revision(?::[^=]*)?=(.*)$", re.M)
+_QUOTED = re.compile(r"['\"](\w+)['\"]")
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def alembic_revisions(versions_dir: Path = VERSIONS_DIR) -> tuple[set, set]:
+    """(every revision, the head revision(s)) of the shipped migrations."""
+    revisions = set()
+    parents = set()
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text()
+        revision = _REVISION.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down = _DOWN_REVISION.search(source)
+        if down is not None:
+            parents.update(_QUOTED.findall(down.group(1)))
+    return revisions, revisions - parents
+
+
+def database_revisions(engine: Engine) -> set[str]:
+    """The revision(s) recorded in the database's alembic_version table."""
+    with engine.connect() as connection:
+        if not inspect(connection).has_table("alembic_version"):
+            return set()
+        rows = connection.execute(text("SELECT version_num FROM alembic_version"))
+        return {version for (version,) in rows}
+
+
+def unversioned_tables(engine: Engine) -> list[str]:
+    """Tables of a database Alembic has never touched (no alembic_version),
+    e.g. one built with Base.metadata.create_all."""
+    with engine.connect() as connection:
+        names = inspect(connection).get_table_names()
+    return [] if "alembic_version" in names else names
+
+
+STAMP_HINT = (
+    "It was created without Alembic: if its tables match the current "
+    "models, record that with `alembic stamp head` from backend/ (otherwise "
+    "stamp the revision they match), then run `alembic upgrade head`."
+)
+
+
+def check_schema(engine: Engine) -> str:
+    """Raise SchemaOutOfDate unless the database is at the Alembic head.
+
+    Returns the revision.
+    """
+    known, heads = alembic_revisions()
+    current = database_revisions(engine)
+    if current == heads:
+        return ", ".join(sorted(current))
+
+    url = engine.url.render_as_string(hide_password=True)
+    expected = ", ".join(sorted(heads))
+    if not current and unversioned_tables(engine):
+        raise SchemaOutOfDate(
+            f"Database {url} has tables but no Alembic revision; expected "
+            f"{expected}. {STAMP_HINT}"
+        )
+    if not current:
+        detail = "has no Alembic revision"
+    elif current - known:
+        detail = f"is at {', '.join(sorted(current))}, which this code doesn't know"
+    else:
+        detail = f"is at {', '.join(sorted(current))}"
+    raise SchemaOutOfDate(
+        f"Database {url} {detail}; expected {expected}. Run `alembic upgrade "
+        "head` from backend/ (or set SCHEMA_CHECK=false to skip this check)."
+    )
@@ -0,0 +1,62 @@
+# Full-text index over items.name / description / item_number / category.
+#
+# SQLite: an external-content FTS5 table kept in sync by triggers.
+# Postgres: a generated tsvector column with a GIN index.
+# Mirrored by the "item full text search" Alembic migration; this module
+# covers databases created through Base.metadata.create_all.
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+        name, description, item_number, category,
+        content='items', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts(rowid, name, description, item_number, category)
+        VALUES (new.id, new.name, new.description, new.item_number, new.category);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, description, item_number, category)
+        VALUES ('delete', old.id, old.name, old.description, old.item_number, old.category);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_au
+    AFTER UPDATE OF name, description, item_number, category ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, description, item_number, category)
+        VALUES ('delete', old.id, old.name, old.description, old.item_number, old.category);
+        INSERT INTO items_fts(rowid, name, description, item_number, category)
+        VALUES (new.id, new.name, new.description, new.item_number, new.category);
+    END
+    """,
+    # Backfill rows that existed before the index
+    "INSERT INTO items_fts(items_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_DDL = [
+    """
+    ALTER TABLE items ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(item_number, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(category, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_items_search_vector ON items USING gin (search_vector)",
+]
+
+
+def create_item_search_index(target, connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        statements = SQLITE_DDL
+    elif connection.dialect.name == "postgresql":
+        statements = POSTGRES_DDL
+    else:
+        return
+    for stmt in statements:
+        connection.exec_driver_sql(stmt)
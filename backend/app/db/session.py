@@ -1,17 +1,100 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
+from app.core.config import (
+    DB_MODE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_KIB,
+    SQLITE_MMAP_SIZE,
+)
+from app.db.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 
 # Render Postgres often gives postgres://..., SQLAlchemy wants postgresql://...
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+# In-memory SQLite lives inside a single connection, so it keeps
+# SQLAlchemy's default single-connection pool
+IS_SQLITE_MEMORY = IS_SQLITE and (
+    DATABASE_URL in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in DATABASE_URL
+)
+
 connect_args = {}
-if DATABASE_URL.startswith("sqlite"):
+if IS_SQLITE:
     connect_args = {"check_same_thread": False}
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+
+def _pool_kwargs(poolclass) -> dict:
+    if IS_SQLITE_MEMORY:
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    # WAL lets readers run alongside the single writer; busy_timeout makes a
+    # blocked writer wait instead of failing with "database is locked".
+    cursor = dbapi_connection.cursor()
+    if not IS_SQLITE_MEMORY:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KIB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+
+engine = create_engine(
+    DATABASE_URL, connect_args=connect_args, **_pool_kwargs(TimedQueuePool)
+)
+if IS_SQLITE:
+    event.listen(engine, "connect", _set_sqlite_pragmas)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver in url for its asyncio counterpart."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if dialect == "postgresql":
+        return f"postgresql+asyncpg{sep}{rest}"
+    raise ValueError(f"No async driver configured for {dialect!r}")
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        async_database_url(DATABASE_URL),
+        **_pool_kwargs(TimedAsyncAdaptedQueuePool),
+    )
+    if IS_SQLITE:
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    # Objects must stay readable after commit: there is no implicit IO
+    # (lazy refresh) once control is back on the event loop.
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+elif DB_MODE != "sync":
+    raise ValueError("DB_MODE must be 'sync' or 'async'")
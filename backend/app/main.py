@@ -1,11 +1,28 @@
-from fastapi import FastAPI
-from app.api.v1.router import router as api_v1_router
-from fastapi.staticfiles import StaticFiles
-import os
+import time
+
+_import_started = time.perf_counter()
 
-os.makedirs("app/static/uploads", exist_ok=True)
+from fastapi import FastAPI, Request, Response
+from app.api.v1.router import router as api_v1_router
+import logging
+import secrets
+
+from app.core.config import (
+    DEBUG,
+    METRICS_ENABLED,
+    METRICS_TOKEN,
+    SCHEMA_CHECK,
+    SQL_PROFILER,
+)
 
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    STARTUP_SECONDS,
+    MetricsMiddleware,
+    instrument_engine,
+    render_metrics,
+)
 
 app = FastAPI(title="Inventory & Scheduling API", version="0.1.0")
 
@@ -18,15 +35,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if SQL_PROFILER:
+    from app.core import sql_profiler
+
+    app.add_middleware(sql_profiler.SqlProfilerMiddleware, server_timing=DEBUG)
 
 app.include_router(api_v1_router, prefix="/api/v1")
 
-from app.db.session import engine
+from app.db.session import engine, async_engine
+
+if METRICS_ENABLED:
+    instrument_engine(engine)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+if SQL_PROFILER:
+    sql_profiler.instrument_engine(engine)
+    if async_engine is not None:
+        sql_profiler.instrument_engine(async_engine.sync_engine)
 from app.db.base import Base  # triggers model imports
+from app.db.migrations import check_schema
+from app.core.security import shutdown_password_hasher
+from app.services.image_service import shutdown_image_workers
 
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
+from app.core.static import CachedIndexHtml, CachedStaticFiles, IMMUTABLE, REVALIDATE
 from pathlib import Path
 from fastapi import HTTPException
 
@@ -35,10 +70,32 @@ frontend_dist = Path(__file__).resolve().parents[2] / "frontend" / "dist"
 
 assets_dir = frontend_dist / "assets"
 if assets_dir.exists():
-    app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
-
+    # Vite fingerprints everything under assets/, so names change with content
+    app.mount(
+        "/assets",
+        CachedStaticFiles(
+            directory=assets_dir,
+            cache_control=lambda path: IMMUTABLE,
+            precompressed=True,
+        ),
+        name="assets",
+    )
+
+
+# Upload names are content hashes (or unique ids for older ones) and are
+# never rewritten in place
+app.mount(
+    "/static",
+    CachedStaticFiles(
+        directory="app/static",
+        cache_control=lambda path: (
+            IMMUTABLE if path.startswith("uploads/") else REVALIDATE
+        ),
+    ),
+    name="static",
+)
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+spa_index = CachedIndexHtml(frontend_dist / "index.html")
 
 
 @app.get("/health")
@@ -46,18 +103,56 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not secrets.compare_digest(
+        request.headers.get("authorization", ""), f"Bearer {METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/{path:path}")
-def spa(path: str):
+async def spa(path: str, request: Request):
     # Don't hijack backend routes / static files
-    if path.startswith(("api", "static", "assets", "health")):
+    if path.startswith(("api", "static", "assets", "health", "metrics")):
         raise HTTPException(status_code=404, detail="Not found")
 
-    index = frontend_dist / "index.html"
-    if index.exists():
-        return FileResponse(index)
+    response = spa_index.response(request)
+    if response is not None:
+        return response
     return {"detail": "Frontend not built"}
 
 
+# uvicorn's own logger, so the report shows up next to its startup lines
+startup_logger = logging.getLogger("uvicorn.error")
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
+
 @app.on_event("startup")
-def _create_tables():
-    Base.metadata.create_all(bind=engine)
+def _startup_report():
+    started = time.perf_counter()
+    revision = "not checked"
+    if SCHEMA_CHECK:
+        # Raises SchemaOutOfDate, and the server stops, when migrations are due
+        revision = check_schema(engine)
+    check_seconds = time.perf_counter() - started
+
+    STARTUP_SECONDS.set(IMPORT_SECONDS, "import")
+    STARTUP_SECONDS.set(check_seconds, "schema_check")
+    startup_logger.info(
+        "Startup: app import %.0f ms, schema check %.0f ms (revision %s)",
+        IMPORT_SECONDS * 1000,
+        check_seconds * 1000,
+        revision,
+    )
+
+
+@app.on_event("shutdown")
+async def _shutdown():
+    shutdown_password_hasher()
+    shutdown_image_workers()
+    if async_engine is not None:
+        await async_engine.dispose()
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String
+from app.db.base_class import Base
+
+
+class ChangeVersion(Base):
+    """How many times the data behind a cached list has changed.
+
+    Writers bump their keys in the same transaction as the write, so every
+    process (API workers, import and snapshot scripts) shares one counter.
+    See app/core/versions.py.
+    """
+
+    __tablename__ = "change_versions"
+
+    key = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,5 +1,19 @@
-from sqlalchemy import Column, Integer, String, Text, Numeric
+from sqlalchemy import (
+    Column,
+    Index,
+    Integer,
+    String,
+    Text,
+    Numeric,
+    case,
+    event,
+    func,
+    select,
+)
+from sqlalchemy.orm import column_property, relationship
 from app.db.base_class import Base
+from app.db.search import create_item_search_index
+from app.models.item_stock_shard import ItemStockShard
 
 
 class Item(Base):
@@ -21,3 +35,32 @@ class Item(Base):
     # NEW
     category = Column(String(100), nullable=False, default="Office Supplies")
     subcategory = Column(String(100), nullable=True)
+
+    # > 0: stock lives in that many item_stock_shards rows and qty_in_stock
+    # stays 0 (see app/services/stock_service.py)
+    stock_shards = Column(Integer, nullable=False, default=0, server_default="0")
+    shard_rows = relationship(ItemStockShard, cascade="all, delete-orphan")
+
+    # What the API reports as qty_in_stock, in either mode
+    available_stock = column_property(
+        case(
+            (
+                stock_shards > 0,
+                select(func.coalesce(func.sum(ItemStockShard.qty), 0))
+                .where(ItemStockShard.item_id == id)
+                .correlate_except(ItemStockShard)
+                .scalar_subquery(),
+            ),
+            else_=qty_in_stock,
+        )
+    )
+
+    # Keyset pagination: each (filter, sort) combination walks one index
+    __table_args__ = (
+        Index("ix_items_name_id", "name", "id"),
+        Index("ix_items_category_id", "category", "id"),
+        Index("ix_items_category_subcategory_id", "category", "subcategory", "id"),
+    )
+
+
+event.listen(Item.__table__, "after_create", create_item_search_index)
@@ -0,0 +1,20 @@
+from sqlalchemy import CheckConstraint, Column, ForeignKey, Integer
+from app.db.base_class import Base
+
+
+class ItemStockShard(Base):
+    """One slice of the stock of an item in sharded stock mode.
+
+    The item's stock is the sum of its shards; checkouts take from one
+    shard so concurrent buyers of a hot item rarely wait on the same row.
+    """
+
+    __tablename__ = "item_stock_shards"
+
+    item_id = Column(
+        Integer, ForeignKey("items.id", ondelete="CASCADE"), primary_key=True
+    )
+    shard = Column(Integer, primary_key=True)
+    qty = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (CheckConstraint("qty >= 0", name="ck_item_stock_shards_qty"),)
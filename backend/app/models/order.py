@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, DateTime, Numeric, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base_class import Base
@@ -8,10 +8,10 @@ class Order(Base):
     __tablename__ = "orders"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
 
     status = Column(
-        String(30), nullable=False, default="in_progress"
+        String(30), nullable=False, default="in_progress", index=True
     )  # in_progress/shipped/complete
 
     subtotal = Column(Numeric(10, 2), nullable=False, default=0)
@@ -23,3 +23,6 @@ class Order(Base):
     items = relationship(
         "OrderItem", back_populates="order", cascade="all, delete-orphan"
     )
+
+    # Keyset pagination on (created_at, id), newest first
+    __table_args__ = (Index("ix_orders_created_at_id", "created_at", "id"),)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Date, Integer, Numeric, String
+from app.db.base_class import Base
+
+
+class SalesDaily(Base):
+    """Sales of one item on one day (UTC), kept up to date by checkout.
+
+    Analytics read this instead of scanning orders and order_items; it can
+    be recomputed from them with app.scripts.rebuild_sales_rollups.
+    """
+
+    __tablename__ = "sales_daily"
+
+    day = Column(Date, primary_key=True)
+    category = Column(String(100), primary_key=True)
+    item_number = Column(String(50), primary_key=True)
+
+    units = Column(Integer, nullable=False, default=0)
+    subtotal = Column(Numeric(12, 2), nullable=False, default=0)
+    tax = Column(Numeric(12, 2), nullable=False, default=0)
+    # Orders that contained the item (an order has one line per item)
+    order_count = Column(Integer, nullable=False, default=0)
@@ -14,3 +14,7 @@ class User(Base):
     is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     deleted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     role: Mapped[str] = mapped_column(String, nullable=False, default="member")
+    # Set on every update; API workers poll it to expire cached principals
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True, index=True, onupdate=datetime.utcnow
+    )
@@ -0,0 +1,34 @@
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SalesPoint(BaseModel):
+    period: date  # first day of the day/week/month
+    units: int
+    subtotal: float
+    tax: float
+    order_count: int
+
+
+class SalesTopEntry(BaseModel):
+    item_number: Optional[str] = None  # None when ranking categories
+    category: str
+    units: int
+    subtotal: float
+    tax: float
+    order_count: int
+
+
+class ReorderSuggestion(BaseModel):
+    item_number: str
+    name: str
+    category: str
+    qty_in_stock: int
+    qty_per_purchase: int
+    velocity: float  # units sold per day
+    days_of_cover: Optional[float] = None  # None: no recent sales
+    safety_stock: int
+    reorder_point: int
+    reorder_qty: int  # 0 when no reorder is needed
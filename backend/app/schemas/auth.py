@@ -1,6 +1,12 @@
 from pydantic import BaseModel
+from typing import Optional
 
 
 class Token(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
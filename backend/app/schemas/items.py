@@ -1,6 +1,9 @@
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field, computed_field, model_validator
 from typing import Optional
 
+from app.core.config import STOCK_SHARDS_MAX
+from app.core.image_variants import variant_urls
+
 
 class ItemBase(BaseModel):
     item_number: str
@@ -20,6 +23,23 @@ class ItemCreate(ItemBase):
     pass
 
 
+# Columns that are NOT NULL in the items table
+ITEM_REQUIRED_COLUMNS = (
+    "name",
+    "description",
+    "qty_per_purchase",
+    "qty_in_stock",
+    "price",
+    "category",
+)
+
+
+def _check_required_not_null(model: BaseModel) -> None:
+    for field in ITEM_REQUIRED_COLUMNS:
+        if field in model.model_fields_set and getattr(model, field) is None:
+            raise ValueError(f"{field} cannot be null")
+
+
 class ItemUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
@@ -31,8 +51,69 @@ class ItemUpdate(BaseModel):
     subcategory: Optional[str] = None
 
 
+class ItemBatchUpdate(ItemUpdate):
+    item_number: str
+    # Relative change instead of a new level, e.g. 5 after a delivery or -2
+    # after a cycle count
+    qty_in_stock_delta: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        if self.qty_in_stock is not None and self.qty_in_stock_delta is not None:
+            raise ValueError("Give qty_in_stock or qty_in_stock_delta, not both")
+        _check_required_not_null(self)
+        if self.model_fields_set <= {"item_number"}:
+            raise ValueError("Nothing to update")
+        return self
+
+
+class ItemBatchResult(BaseModel):
+    updated: int
+    not_found: list[str]
+
+
+class ItemStockShardsUpdate(BaseModel):
+    # 0 turns sharded stock off again
+    shards: int = Field(ge=0, le=STOCK_SHARDS_MAX)
+
+
 class ItemRead(ItemBase):
     id: int
+    # Items with sharded stock keep 0 in the qty_in_stock column
+    qty_in_stock: int = Field(
+        ge=0, validation_alias=AliasChoices("available_stock", "qty_in_stock")
+    )
+
+    # {"thumb" | "card" | "detail": {"webp": url, "jpg": url}}
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[dict[str, dict[str, str]]]:
+        return variant_urls(self.image_url)
 
     class Config:
         from_attributes = True
+
+
+class ItemImportRow(ItemUpdate):
+    # Any subset of the columns; a row for a new item_number must also pass
+    # ItemCreate
+    item_number: str
+
+    @model_validator(mode="after")
+    def check_not_null(self):
+        _check_required_not_null(self)
+        return self
+
+
+class ItemImportError(BaseModel):
+    row: int  # line number in the uploaded file
+    item_number: Optional[str] = None
+    error: str
+
+
+class ItemImportReport(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    errors: list[ItemImportError]
+    errors_truncated: bool = False
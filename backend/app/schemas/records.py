@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from app.core.image_variants import variant_urls
+
+# Lightweight read models for the list endpoints. They are built straight
+# from Core result rows (unpacked by position, which is much cheaper than
+# Row attribute access) and serialized by FastJSONResponse without another
+# validation pass; field order and types match ItemRead / OrderRead so the
+# JSON is identical.
+
+
+@dataclass(slots=True)
+class ItemRecord:
+    item_number: str
+    name: str
+    description: str
+    qty_per_purchase: int
+    qty_in_stock: int
+    price: float
+    image_url: Optional[str]
+    category: str
+    subcategory: Optional[str]
+    id: int
+    image_variants: Optional[dict[str, dict[str, str]]]
+
+    @classmethod
+    def from_row(cls, row: Any) -> "ItemRecord":
+        """row is (id, item_number, name, description, qty_per_purchase,
+        qty_in_stock, price, image_url, category, subcategory)."""
+        (
+            id,
+            item_number,
+            name,
+            description,
+            qty_per_purchase,
+            qty_in_stock,
+            price,
+            image_url,
+            category,
+            subcategory,
+        ) = row
+        return cls(
+            item_number,
+            name,
+            description,
+            qty_per_purchase,
+            qty_in_stock,
+            float(price),
+            image_url,
+            category,
+            subcategory,
+            id,
+            variant_urls(image_url),
+        )
+
+
+@dataclass(slots=True)
+class OrderItemRecord:
+    item_number: str
+    name: str
+    unit_price: float
+    quantity: int
+    line_total: float
+
+    @classmethod
+    def from_row(cls, row: Any) -> "OrderItemRecord":
+        """row is (item_number, name, unit_price, quantity, line_total)."""
+        item_number, name, unit_price, quantity, line_total = row
+        return cls(item_number, name, float(unit_price), quantity, float(line_total))
+
+
+@dataclass(slots=True)
+class OrderRecord:
+    id: int
+    status: str
+    subtotal: float
+    tax: float
+    total: float
+    created_at: datetime
+    items: list[OrderItemRecord]
+
+    @classmethod
+    def from_row(cls, row: Any) -> "OrderRecord":
+        """row is (id, status, subtotal, tax, total, created_at)."""
+        id, status, subtotal, tax, total, created_at = row
+        return cls(id, status, float(subtotal), float(tax), float(total), created_at, [])
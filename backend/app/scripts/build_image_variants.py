@@ -0,0 +1,36 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import IMAGE_WORKERS, UPLOADS_DIR
+from app.core.image_variants import is_variant_filename
+from app.services.image_service import generate_variants
+
+# Backfill thumbnails/WebP derivatives for every upload that lacks them.
+# Run from backend/: python -m app.scripts.build_image_variants
+
+
+def main() -> None:
+    sources = [
+        os.path.join(UPLOADS_DIR, name)
+        for name in sorted(os.listdir(UPLOADS_DIR))
+        if not name.startswith(".")
+        and not name.endswith(".part")
+        and not is_variant_filename(name)
+    ]
+
+    written = 0
+    failed = 0
+    with ProcessPoolExecutor(max_workers=max(IMAGE_WORKERS, 1)) as pool:
+        futures = {pool.submit(generate_variants, path): path for path in sources}
+        for future, path in futures.items():
+            try:
+                written += len(future.result())
+            except Exception as e:
+                failed += 1
+                print(f"Failed: {path}: {e}")
+
+    print(f"Checked {len(sources)} images, wrote {written} variants, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,20 @@
-import app.db.base
-from app.db.base import Base
-from app.db.session import engine
+import sys
 
-# Create all tables defined in your SQLAlchemy models
-Base.metadata.create_all(bind=engine)
+from alembic import command
+from alembic.config import Config
 
-print("All tables created successfully!")
+from app.db.migrations import ALEMBIC_INI, STAMP_HINT, unversioned_tables
+from app.db.session import DATABASE_URL, engine
+
+# Create the tables, or bring an existing database up to date, through the
+# Alembic migrations. Run from backend/: python -m app.scripts.init_db
+
+if unversioned_tables(engine):
+    url = engine.url.render_as_string(hide_password=True)
+    sys.exit(f"Not migrating {url}. {STAMP_HINT}")
+
+config = Config(str(ALEMBIC_INI))
+config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+command.upgrade(config, "head")
+
+print("Database is at the latest revision")
@@ -10,6 +10,8 @@ if not u:
     print("User not found")
 else:
     u.role = ROLE
+    # Sets users.updated_at, which running API workers poll to expire
+    # their cached principal (USER_CHANGES_POLL_SECONDS)
     db.commit()
     print(f"Set {EMAIL} to {ROLE}")
 db.close()
@@ -0,0 +1,28 @@
+import time
+from datetime import date
+
+from app.db.session import SessionLocal
+from app.services.analytics_service import rebuild_sales_rollups
+
+# Recompute the sales_daily rollups from orders and order_items, e.g. after
+# upgrading an existing database or fixing order data by hand. Chunk size:
+# ROLLUP_REBUILD_CHUNK. Run from backend/:
+# python -m app.scripts.rebuild_sales_rollups
+
+
+def main() -> None:
+    started = time.perf_counter()
+
+    def progress(done: int, before: date | None) -> None:
+        print(f"{done} orders" + (f" (days before {before})" if before else ""))
+
+    db = SessionLocal()
+    try:
+        done = rebuild_sales_rollups(db, progress=progress)
+    finally:
+        db.close()
+    print(f"Rebuilt rollups from {done} orders in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import csv
+import sys
+
+from app.core.config import REORDER_LEAD_TIME_DAYS, REORDER_REVIEW_DAYS
+from app.db.session import SessionLocal
+from app.services.reorder_service import reorder_suggestions
+
+# Print today's reorder suggestions as CSV, e.g. for a daily cron job.
+# Run from backend/: python -m app.scripts.reorder_report [--all] > reorder.csv
+
+COLUMNS = (
+    "item_number",
+    "name",
+    "category",
+    "qty_in_stock",
+    "qty_per_purchase",
+    "velocity",
+    "days_of_cover",
+    "safety_stock",
+    "reorder_point",
+    "reorder_qty",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print reorder suggestions as CSV")
+    parser.add_argument(
+        "--all", action="store_true", help="also list items that need no reorder"
+    )
+    parser.add_argument("--lead-time", type=float, default=REORDER_LEAD_TIME_DAYS)
+    parser.add_argument("--review-days", type=float, default=REORDER_REVIEW_DAYS)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        suggestions = reorder_suggestions(
+            db,
+            lead_time_days=args.lead_time,
+            review_days=args.review_days,
+            include_all=args.all,
+        )
+    finally:
+        db.close()
+
+    writer = csv.DictWriter(sys.stdout, fieldnames=COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(suggestions)
+
+
+if __name__ == "__main__":
+    main()
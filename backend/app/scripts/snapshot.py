@@ -0,0 +1,68 @@
+import argparse
+import sys
+import time
+
+from app.core.config import SNAPSHOT_CHUNK_SIZE
+from app.db.session import SessionLocal
+from app.services.snapshot_service import dump_snapshot, restore_snapshot
+
+# Copy users, items (with stock shards), orders and order_items between
+# databases, e.g. production into staging. Works with SQLite and Postgres,
+# in either direction. Run from backend/:
+#
+# DATABASE_URL=<source> python -m app.scripts.snapshot dump snap/ --anonymize
+# alembic upgrade head   # on the target
+# DATABASE_URL=<target> python -m app.scripts.snapshot restore snap/
+# DATABASE_URL=<target> python -m app.scripts.rebuild_sales_rollups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dump or restore a data snapshot")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    dump = commands.add_parser("dump", help="write a snapshot of DATABASE_URL")
+    dump.add_argument("directory")
+    dump.add_argument(
+        "--anonymize", action="store_true", help="replace user emails and names"
+    )
+    dump.add_argument("--chunk-size", type=int, default=SNAPSHOT_CHUNK_SIZE)
+
+    restore = commands.add_parser("restore", help="load a snapshot into DATABASE_URL")
+    restore.add_argument("directory")
+    restore.add_argument(
+        "--replace", action="store_true", help="delete the existing rows first"
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+
+    def progress(table: str, rows: int) -> None:
+        print(f"{table}: {rows} rows")
+
+    db = SessionLocal()
+    try:
+        if args.command == "dump":
+            manifest = dump_snapshot(
+                db,
+                args.directory,
+                anonymize=args.anonymize,
+                chunk_size=args.chunk_size,
+                progress=progress,
+            )
+            counts = {name: t["rows"] for name, t in manifest["tables"].items()}
+        else:
+            counts = restore_snapshot(
+                db, args.directory, replace=args.replace, progress=progress
+            )
+    except ValueError as e:
+        sys.exit(str(e))
+    finally:
+        db.close()
+
+    summary = ", ".join(f"{rows} {table}" for table, rows in counts.items())
+    verb = "Dumped" if args.command == "dump" else "Restored"
+    print(f"{verb} {summary} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import ROUND_DOWN, Decimal
+from itertools import groupby
+from typing import Iterable
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import ROLLUP_REBUILD_CHUNK
+from app.models.item import Item
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.sales_rollup import SalesDaily
+from app.services.catalog_service import UPSERT_DIALECTS
+
+SALES_MEASURES = ("units", "subtotal", "tax", "order_count")
+# Rebuilds file lines of since-deleted items under this category
+UNKNOWN_CATEGORY = "Unknown"
+
+CENT = Decimal("0.01")
+
+# (category, item_number, quantity, line_total)
+SaleLine = tuple[str, str, int, float]
+# (day, order tax, lines)
+OrderSale = tuple[date, float, list[SaleLine]]
+
+
+def allocate_tax(line_totals: list[Decimal], tax: Decimal) -> list[Decimal]:
+    """Split an order's tax over its lines in proportion to line_total.
+
+    Whole cents, rounded down, with the remainder on the last line, so the
+    parts always add up to the order's tax.
+    """
+    subtotal = sum(line_totals)
+    if not subtotal:
+        return [Decimal(0)] * (len(line_totals) - 1) + [tax]
+    parts = [
+        (tax * total / subtotal).quantize(CENT, rounding=ROUND_DOWN)
+        for total in line_totals[:-1]
+    ]
+    return parts + [tax - sum(parts)]
+
+
+def record_sales(db: Session, orders: Iterable[OrderSale]) -> None:
+    """Add orders to the daily rollups. Does not commit."""
+    rows: dict[tuple[date, str, str], dict] = {}
+    for day, tax, lines in orders:
+        line_totals = [Decimal(str(line[3])) for line in lines]
+        taxes = allocate_tax(line_totals, Decimal(str(tax)))
+        for (category, item_number, quantity, _), total, line_tax in zip(
+            lines, line_totals, taxes
+        ):
+            row = rows.get((day, category, item_number))
+            if row is None:
+                row = rows[day, category, item_number] = {
+                    "day": day,
+                    "category": category,
+                    "item_number": item_number,
+                    "units": 0,
+                    "subtotal": Decimal(0),
+                    "tax": Decimal(0),
+                    "order_count": 0,
+                }
+            row["units"] += quantity
+            row["subtotal"] += total
+            row["tax"] += line_tax
+            row["order_count"] += 1
+
+    if rows:
+        for row in rows.values():
+            row["subtotal"] = float(row["subtotal"])
+            row["tax"] = float(row["tax"])
+        _add_to_rollups(db, list(rows.values()))
+
+
+def _add_to_rollups(db: Session, rows: list[dict]) -> None:
+    table = SalesDaily.__table__
+    insert_fn = UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    if insert_fn is not None:
+        stmt = insert_fn(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.day, table.c.category, table.c.item_number],
+            set_={c: table.c[c] + stmt.excluded[c] for c in SALES_MEASURES},
+        )
+        db.execute(stmt, rows)
+        return
+
+    # No upsert syntax: add to the rows that exist, insert the rest
+    for row in rows:
+        result = db.execute(
+            table.update()
+            .where(
+                table.c.day == row["day"],
+                table.c.category == row["category"],
+                table.c.item_number == row["item_number"],
+            )
+            .values({c: table.c[c] + row[c] for c in SALES_MEASURES})
+        )
+        if result.rowcount == 0:
+            db.execute(table.insert(), [row])
+
+
+def order_day(created_at: datetime) -> date:
+    # created_at is naive UTC (datetime.utcnow)
+    return created_at.date()
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+def rebuild_sales_rollups(
+    db: Session, chunk_size: int = ROLLUP_REBUILD_CHUNK, progress=None
+) -> int:
+    """Recompute the rollups from orders and order_items.
+
+    Works through whole days of about chunk_size orders at a time. Each
+    chunk deletes and recomputes its days in one transaction, so analytics
+    never see a day half rebuilt, and an interrupted rebuild leaves every
+    day either as it was or rebuilt. Lines are filed under their item's
+    current category. On SQLite checkouts can go on meanwhile; on
+    Postgres one committing while its day is rebuilt can be counted
+    twice, so run it at a quiet time there. Returns the number of orders
+    processed.
+    """
+    done = 0
+    # The first chunk also clears days before the first order, the last
+    # one days after the last
+    lower: date | None = None
+    while True:
+        boundary = (
+            select(Order.created_at)
+            .order_by(Order.created_at)
+            .offset(chunk_size - 1)
+            .limit(1)
+        )
+        if lower is not None:
+            boundary = boundary.where(Order.created_at >= _day_start(lower))
+        last = db.scalar(boundary)
+        upper = order_day(last) + timedelta(days=1) if last is not None else None
+
+        days = []
+        placed = []
+        if lower is not None:
+            days.append(SalesDaily.day >= lower)
+            placed.append(Order.created_at >= _day_start(lower))
+        if upper is not None:
+            days.append(SalesDaily.day < upper)
+            placed.append(Order.created_at < _day_start(upper))
+
+        # Delete first: on SQLite that takes the write lock, so no checkout
+        # commits between reading the orders and writing their rollups
+        db.execute(delete(SalesDaily).where(*days))
+        rows = db.execute(
+            select(
+                Order.id,
+                Order.created_at,
+                Order.tax,
+                func.coalesce(Item.category, UNKNOWN_CATEGORY),
+                OrderItem.item_number,
+                OrderItem.quantity,
+                OrderItem.line_total,
+            )
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .outerjoin(Item, Item.item_number == OrderItem.item_number)
+            .where(*placed)
+            .order_by(Order.id, OrderItem.id)
+        )
+        orders = [
+            (order_day(created_at), tax, [tuple(line[3:]) for line in lines])
+            for (_, created_at, tax), lines in groupby(rows, key=lambda r: r[:3])
+        ]
+        record_sales(db, orders)
+        db.commit()
+
+        done += len(orders)
+        if progress is not None:
+            progress(done, upper)
+        if upper is None:
+            return done
+        lower = upper
+
+
+def default_range(start: date | None, end: date | None) -> tuple[date, date]:
+    """Fill in a missing end with today (UTC) and start with 30 days back."""
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise ValueError("start must not be after end")
+    return start, end
+
+
+def _measures():
+    return (
+        func.sum(SalesDaily.units).label("units"),
+        func.sum(SalesDaily.subtotal).label("subtotal"),
+        func.sum(SalesDaily.tax).label("tax"),
+        func.sum(SalesDaily.order_count).label("order_count"),
+    )
+
+
+def _period_start(day: date, interval: str) -> date:
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    return day
+
+
+def sales_series(
+    db: Session,
+    start: date,
+    end: date,
+    interval: str = "day",
+    category: str | None = None,
+    item_number: str | None = None,
+) -> list[dict]:
+    """Sales per day, week (from Monday) or month between start and end.
+
+    Periods without sales are left out. order_count is summed over items,
+    so without an item_number filter an order counts once per item in it.
+    """
+    stmt = (
+        select(SalesDaily.day, *_measures())
+        .where(SalesDaily.day >= start, SalesDaily.day <= end)
+        .group_by(SalesDaily.day)
+        .order_by(SalesDaily.day)
+    )
+    if category is not None:
+        stmt = stmt.where(SalesDaily.category == category)
+    if item_number is not None:
+        stmt = stmt.where(SalesDaily.item_number == item_number)
+
+    series: dict[date, dict] = {}
+    for day, units, subtotal, tax, order_count in db.execute(stmt):
+        period = _period_start(day, interval)
+        point = series.get(period)
+        if point is None:
+            point = series[period] = {
+                "period": period,
+                "units": 0,
+                "subtotal": 0.0,
+                "tax": 0.0,
+                "order_count": 0,
+            }
+        point["units"] += units
+        point["subtotal"] += float(subtotal)
+        point["tax"] += float(tax)
+        point["order_count"] += order_count
+    for point in series.values():
+        point["subtotal"] = round(point["subtotal"], 2)
+        point["tax"] = round(point["tax"], 2)
+    return list(series.values())
+
+
+def top_sales(
+    db: Session,
+    start: date,
+    end: date,
+    by: str = "item",
+    metric: str = "subtotal",
+    limit: int = 10,
+    category: str | None = None,
+) -> list[dict]:
+    """The limit best items or categories between start and end by metric."""
+    if metric not in SALES_MEASURES:
+        raise ValueError(f"Unknown metric: {metric}")
+    if by == "item":
+        keys = (
+            SalesDaily.item_number,
+            func.max(SalesDaily.category).label("category"),
+        )
+        group_by = SalesDaily.item_number
+    else:
+        keys = (SalesDaily.category,)
+        group_by = SalesDaily.category
+
+    stmt = (
+        select(*keys, *_measures())
+        .where(SalesDaily.day >= start, SalesDaily.day <= end)
+        .group_by(group_by)
+        .order_by(func.sum(getattr(SalesDaily, metric)).desc(), group_by)
+        .limit(limit)
+    )
+    if category is not None:
+        stmt = stmt.where(SalesDaily.category == category)
+
+    return [
+        {
+            "item_number": row._mapping.get("item_number"),
+            "category": row.category,
+            "units": row.units,
+            "subtotal": round(float(row.subtotal), 2),
+            "tax": round(float(row.tax), 2),
+            "order_count": row.order_count,
+        }
+        for row in db.execute(stmt)
+    ]
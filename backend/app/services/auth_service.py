@@ -1,17 +1,57 @@
+from datetime import datetime
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.core.security import verify_password
+from app.core.auth_cache import invalidate_user
+from app.core.security import verify_password, verify_password_async
+from app.db.deps import run_db
 from app.models.user import User
 
 
-def authenticate_user(db: Session, email: str, password: str) -> User | None:
+def get_active_user_by_email(db: Session, email: str) -> User | None:
     # IMPORTANT: deleted users are not allowed to authenticate
-    user = (
+    return (
         db.query(User)
         .filter(User.email == email, User.is_deleted == False)  # noqa: E712
         .first()
     )
+
+
+def expire_changed_users(db: Session, since: datetime) -> None:
+    """Drop users changed since `since`, by any process, from the principal
+    cache (see claim_user_changes_poll)."""
+    changed = db.scalars(select(User.email).where(User.updated_at >= since)).all()
+    for email in changed:
+        invalidate_user(email)
+
+
+def authenticate_user(db: Session, email: str, password: str) -> User | None:
+    user = get_active_user_by_email(db, email)
     if not user:
         return None
     if not verify_password(password, user.hashed_password):
         return None
     return user
+
+
+def _get_detached_user(db: Session, email: str) -> User | None:
+    # Hand the pooled connection back before waiting on bcrypt, otherwise a
+    # login burst pins every connection while queued for the hashing pool.
+    user = get_active_user_by_email(db, email)
+    if user:
+        db.expunge(user)
+    db.rollback()
+    return user
+
+
+async def authenticate_user_async(
+    db: Session, email: str, password: str
+) -> User | None:
+    """authenticate_user for async endpoints: the lookup goes through
+    run_db and bcrypt through the password-hashing pool."""
+    user = await run_db(db, _get_detached_user, email)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
@@ -0,0 +1,305 @@
+import csv
+import io
+from typing import BinaryIO, Iterable, Iterator
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import Row, Select, bindparam, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    EXPORT_BATCH_SIZE,
+    IMPORT_BATCH_SIZE,
+    IMPORT_MAX_REPORTED_ERRORS,
+)
+from app.core.events import event_hub
+from app.core.versions import CATALOG, bump
+from app.models.item import Item
+from app.schemas.items import ItemCreate, ItemImportRow
+from app.services.stock_service import set_sharded_stock
+
+# Export column order; also what import understands
+ITEM_FIELDS = (
+    "item_number",
+    "name",
+    "description",
+    "qty_per_purchase",
+    "qty_in_stock",
+    "price",
+    "image_url",
+    "category",
+    "subcategory",
+)
+# Present in API responses; accepted in imports and ignored
+IGNORED_FIELDS = ("id", "image_variants")
+
+UPSERT_DIALECTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def detect_format(filename: str | None, content_type: str | None) -> str | None:
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in (
+        "application/x-ndjson",
+        "application/jsonl",
+    ):
+        return "ndjson"
+    return None
+
+
+def _csv_rows(stream: BinaryIO) -> Iterator[tuple[int, dict | None, str | None]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    header = reader.fieldnames or []
+    if "item_number" not in header:
+        raise ValueError("CSV header must include item_number")
+    unknown = set(header) - set(ITEM_FIELDS) - set(IGNORED_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown CSV columns: {', '.join(sorted(unknown))}")
+
+    for row in reader:
+        if None in row:
+            yield reader.line_num, None, "Too many fields"
+            continue
+        # Empty cells count as "not given", so an upsert leaves them alone
+        values = {k: v for k, v in row.items() if v not in ("", None)}
+        yield reader.line_num, values, None
+
+
+def _ndjson_rows(stream: BinaryIO) -> Iterator[tuple[int, dict | None, str | None]]:
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(data, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        unknown = set(data) - set(ITEM_FIELDS) - set(IGNORED_FIELDS)
+        if unknown:
+            yield line_no, data, f"Unknown fields: {', '.join(sorted(unknown))}"
+            continue
+        yield line_no, data, None
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}"
+        for err in exc.errors()
+    )
+
+
+def _upsert(db: Session, rows: list[dict], ids: dict[str, int]) -> None:
+    """Write rows, one executemany per set of columns.
+
+    Rows for existing items (ids: item_number -> id) become a bulk UPDATE
+    by primary key, so only the columns a row supplies are overwritten;
+    an INSERT would trip over the NOT NULL columns the row leaves out.
+    The rest are inserted, with ON CONFLICT (item_number) DO UPDATE where
+    the dialect has it, for items created since ids was read.
+    """
+    insert_fn = UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    table = Item.__table__
+
+    groups: dict[tuple[str, ...], list[dict]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    for columns, group in groups.items():
+        updates = [
+            {**r, "item_id": ids[r["item_number"]]}
+            for r in group
+            if r["item_number"] in ids
+        ]
+        inserts = [r for r in group if r["item_number"] not in ids]
+        if updates:
+            db.execute(
+                table.update().where(table.c.id == bindparam("item_id")), updates
+            )
+        if not inserts:
+            continue
+        if insert_fn is None:
+            db.execute(table.insert(), inserts)
+            continue
+        stmt = insert_fn(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.item_number],
+            set_={c: stmt.excluded[c] for c in columns if c != "item_number"},
+        )
+        db.execute(stmt, inserts)
+
+
+def _flush(db: Session, batch: dict[str, tuple[int, dict]], report: dict) -> None:
+    if not batch:
+        return
+    # item_number -> (id, stock_shards) for the items that already exist
+    existing = {
+        item_number: (item_id, shards)
+        for item_number, item_id, shards in db.execute(
+            select(Item.item_number, Item.id, Item.stock_shards).where(
+                Item.item_number.in_(list(batch))
+            )
+        )
+    }
+
+    # New items need every column POST /items/ does
+    for item_number in [n for n in batch if n not in existing]:
+        row_no, values = batch[item_number]
+        try:
+            ItemCreate.model_validate(values)
+        except ValidationError as e:
+            _add_error(report, row_no, item_number, _validation_message(e))
+            del batch[item_number]
+
+    def count(item_number: str) -> None:
+        report["updated" if item_number in existing else "created"] += 1
+
+    # Sharded items take their stock through the shards, not the column
+    sharded_stock: dict[str, int] = {}
+    for item_number, (_, values) in batch.items():
+        if existing.get(item_number, (None, 0))[1] and "qty_in_stock" in values:
+            sharded_stock[item_number] = values.pop("qty_in_stock")
+
+    def write(item_numbers: Iterable[str]) -> None:
+        rows = [batch[n][1] for n in item_numbers]
+        # a sharded item's row can be down to just its item_number
+        _upsert(
+            db,
+            [row for row in rows if len(row) > 1],
+            {n: item_id for n, (item_id, _) in existing.items()},
+        )
+        for item_number in item_numbers:
+            if item_number in sharded_stock:
+                set_sharded_stock(
+                    db, existing[item_number][0], sharded_stock[item_number]
+                )
+        bump(db, CATALOG)
+
+    try:
+        write(list(batch))
+        db.commit()
+        for item_number in batch:
+            count(item_number)
+    except SQLAlchemyError:
+        db.rollback()
+        # Find the offending rows: retry one row per transaction
+        for item_number, (row_no, _) in batch.items():
+            try:
+                write([item_number])
+                db.commit()
+                count(item_number)
+            except SQLAlchemyError as e:
+                db.rollback()
+                message = str(getattr(e, "orig", None) or e)
+                _add_error(report, row_no, item_number, message)
+    batch.clear()
+
+
+def _add_error(report: dict, row: int, item_number: str | None, error: str) -> None:
+    report["failed"] += 1
+    if len(report["errors"]) < IMPORT_MAX_REPORTED_ERRORS:
+        report["errors"].append(
+            {"row": row, "item_number": item_number, "error": error}
+        )
+    else:
+        report["errors_truncated"] = True
+
+
+def import_items(
+    db: Session, stream: BinaryIO, fmt: str, batch_size: int = IMPORT_BATCH_SIZE
+) -> dict:
+    """Upsert items by item_number from a CSV or NDJSON file.
+
+    A row for an existing item_number may give any subset of the columns
+    and only those are changed; a row for a new one is validated like
+    POST /items/. Rows are written batch_size at a time,
+    each batch in its own transaction. Bad rows are skipped and reported
+    (row is the line number in the file); the rest still go in.
+    Raises ValueError for an unusable file (bad CSV header).
+    """
+    rows = _csv_rows(stream) if fmt == "csv" else _ndjson_rows(stream)
+    report = {
+        "created": 0,
+        "updated": 0,
+        "failed": 0,
+        "errors": [],
+        "errors_truncated": False,
+    }
+    batch: dict[str, tuple[int, dict]] = {}
+
+    try:
+        for row_no, data, error in rows:
+            item_number = data.get("item_number") if data else None
+            if error is None:
+                for field in IGNORED_FIELDS:
+                    data.pop(field, None)
+                try:
+                    item = ItemImportRow.model_validate(data)
+                    values = item.model_dump(exclude_unset=True)
+                except ValidationError as e:
+                    error = _validation_message(e)
+            if error is not None:
+                _add_error(report, row_no, item_number, error)
+                continue
+
+            # A repeated item_number within a batch: later values win
+            if values["item_number"] in batch:
+                values = {**batch[values["item_number"]][1], **values}
+            batch[values["item_number"]] = (row_no, values)
+            if len(batch) >= batch_size:
+                _flush(db, batch, report)
+    except UnicodeDecodeError:
+        _flush(db, batch, report)
+        _add_error(report, 0, None, "File is not valid UTF-8; import stopped")
+        return report
+
+    _flush(db, batch, report)
+    if report["created"] or report["updated"]:
+        event_hub.publish(
+            "catalog_changed",
+            {"created": report["created"], "updated": report["updated"]},
+        )
+    return report
+
+
+def _export_column(field: str):
+    if field == "qty_in_stock":
+        return Item.available_stock.label(field)
+    return getattr(Item, field)
+
+
+def item_export_query() -> Select:
+    return (
+        select(*(_export_column(f) for f in ITEM_FIELDS))
+        .order_by(Item.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def export_header(fmt: str) -> bytes:
+    if fmt != "csv":
+        return b""
+    return _csv_bytes([ITEM_FIELDS])
+
+
+def export_rows(rows: Iterable[Row], fmt: str) -> bytes:
+    """Encode rows from item_export_query() as CSV lines or NDJSON."""
+    if fmt == "csv":
+        return _csv_bytes((*row[:5], float(row[5]), *row[6:]) for row in rows)
+    return b"".join(
+        orjson.dumps({**row._mapping, "price": float(row.price)}) + b"\n"
+        for row in rows
+    )
+
+
+def _csv_bytes(rows: Iterable[Iterable]) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerows(rows)
+    return buf.getvalue().encode()
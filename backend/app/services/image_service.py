@@ -0,0 +1,146 @@
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.core.config import (
+    IMAGE_MAX_PIXELS,
+    IMAGE_WORKERS,
+    UPLOADS_DIR,
+    UPLOADS_TMP_DIR,
+)
+from app.core.image_variants import (
+    IMAGE_VARIANT_FORMATS,
+    IMAGE_VARIANT_SIZES,
+    variant_filename,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def generate_variants(source_path: str) -> list[str]:
+    """Write every missing size/format derivative of source_path next to it.
+
+    Safe to call repeatedly; existing derivatives are left alone.
+    Returns the paths written.
+    """
+    from PIL import Image, ImageOps
+
+    directory, source_filename = os.path.split(source_path)
+    targets = {
+        (variant, fmt): os.path.join(
+            directory, variant_filename(source_filename, variant, fmt)
+        )
+        for variant in IMAGE_VARIANT_SIZES
+        for fmt in IMAGE_VARIANT_FORMATS
+    }
+    missing = {key: path for key, path in targets.items() if not os.path.exists(path)}
+    if not missing:
+        return []
+
+    os.makedirs(UPLOADS_TMP_DIR, exist_ok=True)
+    written = []
+    with Image.open(source_path) as opened:
+        # Image.open only reads the header; check before anything decodes
+        width, height = opened.size
+        if width * height > IMAGE_MAX_PIXELS:
+            raise ValueError(
+                f"{source_filename} is {width}x{height}, over IMAGE_MAX_PIXELS "
+                f"({IMAGE_MAX_PIXELS})"
+            )
+        image = ImageOps.exif_transpose(opened)
+        has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+        for variant, edge in IMAGE_VARIANT_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+
+            for fmt in IMAGE_VARIANT_FORMATS:
+                path = missing.get((variant, fmt))
+                if not path:
+                    continue
+                tmp_path = os.path.join(
+                    UPLOADS_TMP_DIR, f"variant-{uuid.uuid4().hex}.part"
+                )
+                if fmt == "webp":
+                    resized.save(tmp_path, "WEBP", quality=80, method=4)
+                else:
+                    flat = resized
+                    if has_alpha:
+                        flat = Image.new("RGB", resized.size, (255, 255, 255))
+                        flat.paste(resized, mask=resized.getchannel("A"))
+                    flat.save(
+                        tmp_path, "JPEG", quality=82, optimize=True, progressive=True
+                    )
+                os.replace(tmp_path, path)
+                written.append(path)
+    return written
+
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=max(IMAGE_WORKERS, 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _discard_executor(broken: ProcessPoolExecutor) -> None:
+    # A worker that died (e.g. killed for memory) breaks the pool for good;
+    # the next _get_executor() starts a fresh one
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _log_failure(future: Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Image variant generation failed", exc_info=future.exception())
+
+
+def _submit(path: str) -> None:
+    executor = _get_executor()
+    try:
+        future = executor.submit(generate_variants, path)
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        future = _get_executor().submit(generate_variants, path)
+    future.add_done_callback(_log_failure)
+
+
+def schedule_variants(filename: str) -> None:
+    """Generate derivatives for an upload: queued on the worker pool, or
+    right here with IMAGE_WORKERS=0, so call it from a background task.
+
+    Never raises. The upload is already saved, and without derivatives the
+    original is served (app.scripts.build_image_variants backfills them).
+    """
+    path = os.path.join(UPLOADS_DIR, filename)
+    try:
+        if IMAGE_WORKERS <= 0:
+            generate_variants(path)
+        else:
+            _submit(path)
+    except Exception:
+        logger.exception("Image variant generation failed for %s", filename)
+
+
+def shutdown_image_workers() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
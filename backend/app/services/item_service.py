@@ -1,17 +1,251 @@
+import re
+from collections import Counter
+from fastapi import HTTPException
+from sqlalchemy import (
+    Float,
+    Integer,
+    Select,
+    bindparam,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
 from sqlalchemy.orm import Session
+from app.core.events import event_hub
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.versions import CATALOG, bump
 from app.models.item import Item
 from app.schemas.items import ItemCreate
-from app.schemas.items import ItemUpdate
+from app.schemas.items import ItemBatchUpdate, ItemUpdate
+from app.schemas.records import ItemRecord
+from app.services.stock_service import (
+    add_sharded_stock,
+    set_sharded_stock,
+    set_stock_shards,
+    take_sharded_stock,
+)
 
 
-def list_items(db: Session) -> list[Item]:
-    return db.query(Item).order_by(Item.id.desc()).all()
+# Column order expected by ItemRecord.from_row
+ITEM_RECORD_COLUMNS = (
+    Item.id,
+    Item.item_number,
+    Item.name,
+    Item.description,
+    Item.qty_per_purchase,
+    Item.available_stock,
+    Item.price,
+    Item.image_url,
+    Item.category,
+    Item.subcategory,
+)
+
+
+def _item_page_query(
+    stmt: Select,
+    *,
+    limit: int,
+    cursor: str | None,
+    sort: str,
+    category: str | None,
+    subcategory: str | None,
+    min_price: float | None,
+    max_price: float | None,
+    in_stock: bool,
+) -> Select:
+    if category:
+        stmt = stmt.where(Item.category == category)
+    if subcategory:
+        stmt = stmt.where(Item.subcategory == subcategory)
+    if min_price is not None:
+        stmt = stmt.where(Item.price >= min_price)
+    if max_price is not None:
+        stmt = stmt.where(Item.price <= max_price)
+    if in_stock:
+        stmt = stmt.where(Item.available_stock > 0)
+
+    if sort == "name":
+        if cursor:
+            last_name, last_id = decode_cursor(cursor, 2)
+            stmt = stmt.where(tuple_(Item.name, Item.id) > tuple_(last_name, last_id))
+        stmt = stmt.order_by(Item.name.asc(), Item.id.asc())
+    elif sort == "id":
+        if cursor:
+            (last_id,) = decode_cursor(cursor, 1)
+            stmt = stmt.where(Item.id < last_id)
+        stmt = stmt.order_by(Item.id.desc())
+    else:
+        raise ValueError("Sort must be 'id' or 'name'")
+
+    # Fetch one extra row to know whether another page exists
+    return stmt.limit(limit + 1)
+
+
+def _item_page(rows: list, limit: int, sort: str) -> tuple[list, str | None]:
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    if sort == "name":
+        return rows, encode_cursor(last.name, last.id)
+    return rows, encode_cursor(last.id)
+
+
+def list_items(
+    db: Session,
+    *,
+    limit: int = 100,
+    cursor: str | None = None,
+    sort: str = "id",
+    category: str | None = None,
+    subcategory: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    in_stock: bool = False,
+) -> tuple[list[Item], str | None]:
+    """Return one keyset page of items plus the cursor for the next page.
+
+    sort="id" is newest first (the original ordering); sort="name" is
+    alphabetical with id as the tie-breaker.
+    """
+    stmt = _item_page_query(
+        select(Item),
+        limit=limit,
+        cursor=cursor,
+        sort=sort,
+        category=category,
+        subcategory=subcategory,
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=in_stock,
+    )
+    return _item_page(list(db.scalars(stmt)), limit, sort)
+
+
+def list_item_records(
+    db: Session,
+    *,
+    limit: int = 100,
+    cursor: str | None = None,
+    sort: str = "id",
+    category: str | None = None,
+    subcategory: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    in_stock: bool = False,
+) -> tuple[list[ItemRecord], str | None]:
+    """Same page as list_items, read as plain column rows into ItemRecords."""
+    stmt = _item_page_query(
+        select(*ITEM_RECORD_COLUMNS),
+        limit=limit,
+        cursor=cursor,
+        sort=sort,
+        category=category,
+        subcategory=subcategory,
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=in_stock,
+    )
+    # Plain Core execution; none of the ORM loading machinery is needed
+    rows, next_cursor = _item_page(db.connection().execute(stmt).all(), limit, sort)
+    return [ItemRecord.from_row(row) for row in rows], next_cursor
+
+
+def search_items(db: Session, q: str, limit: int = 20) -> list[Item]:
+    """Rank items matching every term in q (prefix match) by relevance."""
+    terms = re.findall(r"\w+", q.lower())
+    if not terms:
+        return []
+
+    # The text query only ranks ids; loading through select(Item) keeps
+    # column properties such as available_stock
+    dialect = db.get_bind().dialect.name
+    ranked = None
+    if dialect == "sqlite":
+        # bm25 weights follow the FTS column order: name, description,
+        # item_number, category (lower score = better match)
+        match = " ".join(f'"{t}"*' for t in terms)
+        ranked = text(
+            "SELECT rowid AS id, bm25(items_fts, 10.0, 1.0, 8.0, 3.0) AS rank "
+            "FROM items_fts WHERE items_fts MATCH :match"
+        ).bindparams(match=match)
+
+    if dialect == "postgresql":
+        tsquery = " & ".join(f"{t}:*" for t in terms)
+        ranked = text(
+            "SELECT items.id, -ts_rank(items.search_vector, query) AS rank "
+            "FROM items, to_tsquery('english', :tsquery) query "
+            "WHERE items.search_vector @@ query"
+        ).bindparams(tsquery=tsquery)
+
+    if ranked is not None:
+        ranked = ranked.columns(id=Integer, rank=Float).subquery("ranked")
+        return list(
+            db.scalars(
+                select(Item)
+                .join(ranked, ranked.c.id == Item.id)
+                .order_by(ranked.c.rank, Item.id)
+                .limit(limit)
+            )
+        )
+
+    # No text index on other dialects: unranked substring match
+    query = db.query(Item)
+    for t in terms:
+        pattern = f"%{t}%"
+        query = query.filter(
+            or_(
+                Item.name.ilike(pattern),
+                Item.description.ilike(pattern),
+                Item.item_number.ilike(pattern),
+                Item.category.ilike(pattern),
+            )
+        )
+    return query.order_by(Item.id.desc()).limit(limit).all()
 
 
 def get_item_by_item_number(db: Session, item_number: str) -> Item | None:
     return db.query(Item).filter(Item.item_number == item_number).first()
 
 
+def get_items_by_item_numbers(db: Session, item_numbers: list[str]) -> dict[str, Item]:
+    if not item_numbers:
+        return {}
+    rows = db.query(Item).filter(Item.item_number.in_(item_numbers)).all()
+    return {item.item_number: item for item in rows}
+
+
+def decrement_stock(db: Session, item_number: str, quantity: int) -> int | None:
+    """Take quantity out of stock in one guarded UPDATE.
+
+    Returns the stock left afterwards, or None (and changes nothing) when
+    less than quantity was available. Does not commit; the caller owns the
+    transaction and bumps CATALOG before committing.
+    """
+    result = db.execute(
+        update(Item)
+        .where(Item.item_number == item_number, Item.qty_in_stock >= quantity)
+        .values(qty_in_stock=Item.qty_in_stock - quantity)
+        .returning(Item.qty_in_stock)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
+
+
+def publish_stock_changed(item_number: str, qty_in_stock: int) -> None:
+    event_hub.publish(
+        "stock_changed", {"item_number": item_number, "qty_in_stock": qty_in_stock}
+    )
+
+
+# Past this many stock changes one catalog_changed event replaces the
+# per-item ones, which would only overflow subscriber queues
+STOCK_EVENTS_MAX = 100
+
+
 def create_item(db: Session, item_in: ItemCreate) -> Item:
     existing = get_item_by_item_number(db, item_in.item_number)
     if existing:
@@ -19,6 +253,7 @@ def create_item(db: Session, item_in: ItemCreate) -> Item:
 
     item = Item(**item_in.model_dump())
     db.add(item)
+    bump(db, CATALOG)
     db.commit()
     db.refresh(item)
     return item
@@ -29,6 +264,7 @@ def delete_item_by_item_number(db: Session, item_number: str) -> bool:
     if not item:
         return False
     db.delete(item)
+    bump(db, CATALOG)
     db.commit()
     return True
 
@@ -39,6 +275,7 @@ def update_item_image_url(db: Session, item_number: str, image_url: str) -> Item
         return None
 
     setattr(item, "image_url", image_url)
+    bump(db, CATALOG)
     db.commit()
     db.refresh(item)
     return item
@@ -52,9 +289,147 @@ def update_item_by_item_number(
         return None
 
     data = item_in.model_dump(exclude_unset=True)
+    stock_changed = "qty_in_stock" in data
+    if item.stock_shards and stock_changed:
+        set_sharded_stock(db, item.id, data.pop("qty_in_stock"))
     for k, v in data.items():
         setattr(item, k, v)
 
+    bump(db, CATALOG)
+    db.commit()
+    db.refresh(item)
+    if stock_changed:
+        publish_stock_changed(item.item_number, item.available_stock)
+    return item
+
+
+def set_item_stock_shards(db: Session, item_number: str, shards: int) -> Item | None:
+    """Turn sharded stock on (shards > 0), off (0) or reshard an item."""
+    item = get_item_by_item_number(db, item_number)
+    if not item:
+        return None
+
+    set_stock_shards(db, item, shards)
+    bump(db, CATALOG)
     db.commit()
     db.refresh(item)
     return item
+
+
+def _change_sharded_stock(
+    db: Session, item_id: int, shards: int, qty: int | None, delta: int | None
+) -> int | None:
+    if delta is None:
+        set_sharded_stock(db, item_id, qty)
+        return qty
+    if delta >= 0:
+        return add_sharded_stock(db, item_id, shards, delta)
+    return take_sharded_stock(db, item_id, -delta)
+
+
+def batch_update_items(db: Session, updates: list[ItemBatchUpdate]) -> dict:
+    """Apply many partial item updates in one transaction.
+
+    Rows are locked and read once, then written with one executemany
+    UPDATE per combination of changed columns.
+    Unknown item numbers are skipped and reported; a delta that would take
+    stock below zero rejects the whole batch.
+    """
+    numbers = [u.item_number for u in updates]
+    duplicates = sorted(n for n, count in Counter(numbers).items() if count > 1)
+    if duplicates:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Duplicate item_number in batch: {', '.join(duplicates[:20])}",
+        )
+
+    # Read the rows through a no-op UPDATE, as stock_service._lock_all
+    # does: SQLite ignores FOR UPDATE and only takes its write lock on the
+    # first write, so a plain SELECT could be stale by the time the deltas
+    # are checked and applied. The FOR UPDATE subquery keeps checkout's
+    # lock order where row locks exist.
+    locked = (
+        select(Item.id)
+        .where(Item.item_number.in_(numbers))
+        .order_by(Item.item_number)
+        .with_for_update()
+    )
+    rows = db.execute(
+        update(Item)
+        .where(Item.id.in_(locked))
+        .values(qty_in_stock=Item.qty_in_stock)
+        .returning(Item.item_number, Item.id, Item.qty_in_stock, Item.stock_shards)
+        .execution_options(synchronize_session=False)
+    ).all()
+    current = {row.item_number: row for row in rows}
+
+    not_found: list[str] = []
+    short: list[str] = []
+    shards_only = 0
+    new_stock: dict[str, int] = {}
+    groups: dict[tuple[tuple[str, ...], bool], list[dict]] = {}
+    for u in updates:
+        if u.item_number not in current:
+            not_found.append(u.item_number)
+            continue
+        item_id, qty, shards = current[u.item_number][1:]
+
+        values = u.model_dump(
+            exclude_unset=True, exclude={"item_number", "qty_in_stock_delta"}
+        )
+        delta = u.qty_in_stock_delta
+        if shards and (delta is not None or "qty_in_stock" in values):
+            # Sharded stock changes go through the shards, not the column
+            left = _change_sharded_stock(
+                db, item_id, shards, values.pop("qty_in_stock", None), delta
+            )
+            if left is None:
+                short.append(u.item_number)
+                continue
+            new_stock[u.item_number] = left
+            delta = None
+            if not values:
+                shards_only += 1
+                continue
+        elif delta is not None:
+            if qty + delta < 0:
+                short.append(u.item_number)
+                continue
+            new_stock[u.item_number] = qty + delta
+        elif "qty_in_stock" in values:
+            new_stock[u.item_number] = values["qty_in_stock"]
+
+        params = {"b_id": item_id, "b_delta": delta}
+        params.update({f"v_{k}": v for k, v in values.items()})
+        groups.setdefault((tuple(sorted(values)), delta is not None), []).append(
+            params
+        )
+
+    if short:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Not enough stock for {', '.join(short[:20])}",
+        )
+
+    table = Item.__table__
+    updated = shards_only
+    for (columns, has_delta), params in groups.items():
+        values = {c: bindparam(f"v_{c}") for c in columns}
+        if has_delta:
+            values["qty_in_stock"] = table.c.qty_in_stock + bindparam("b_delta")
+        db.execute(
+            table.update().where(table.c.id == bindparam("b_id")).values(values),
+            params,
+        )
+        updated += len(params)
+
+    if updated:
+        bump(db, CATALOG)
+    db.commit()
+    if len(new_stock) > STOCK_EVENTS_MAX:
+        event_hub.publish("catalog_changed", {"created": 0, "updated": updated})
+    else:
+        for item_number, qty in new_stock.items():
+            publish_stock_changed(item_number, qty)
+    return {"updated": updated, "not_found": not_found}
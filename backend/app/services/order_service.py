@@ -0,0 +1,262 @@
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import Select, insert, select, tuple_
+from sqlalchemy.orm import Session, selectinload
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.versions import ALL_ORDERS, CATALOG, bump, user_orders
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.schemas.orders import CartLine
+from app.schemas.records import OrderItemRecord, OrderRecord
+from app.core.events import event_hub
+from app.core.metrics import CHECKOUTS
+from app.services.analytics_service import order_day, record_sales
+from app.services.item_service import (
+    decrement_stock,
+    get_items_by_item_numbers,
+    publish_stock_changed,
+)
+from app.services.stock_service import take_sharded_stock
+
+TAX_RATE = 0.0825
+ORDER_STATUSES = ("in_progress", "shipped", "complete")
+
+
+def get_order(db: Session, order_id: int) -> Order | None:
+    return (
+        db.query(Order)
+        .options(selectinload(Order.items))
+        .filter(Order.id == order_id)
+        .first()
+    )
+
+
+def place_order(db: Session, user_id: int, lines: list[CartLine]) -> Order:
+    if not lines:
+        CHECKOUTS.inc("empty_cart")
+        raise HTTPException(status_code=400, detail="Cart is empty")
+
+    # Collapse repeated lines so each item gets a single stock decrement
+    quantities: dict[str, int] = {}
+    for line in lines:
+        quantities[line.item_number] = (
+            quantities.get(line.item_number, 0) + line.quantity
+        )
+
+    items = get_items_by_item_numbers(db, list(quantities))
+    for item_number, quantity in quantities.items():
+        item = items.get(item_number)
+        if not item:
+            CHECKOUTS.inc("not_found")
+            raise HTTPException(
+                status_code=404, detail=f"Item not found: {item_number}"
+            )
+        if int(getattr(item, "available_stock")) < quantity:
+            CHECKOUTS.inc("out_of_stock")
+            raise HTTPException(
+                status_code=400, detail=f"Not enough stock for {item_number}"
+            )
+
+    # The snapshot above can be stale under concurrent checkouts; the guarded
+    # UPDATE is what actually prevents overselling. Sorted order keeps row
+    # locks acquired in the same sequence across transactions.
+    remaining: dict[str, int] = {}
+    for item_number in sorted(quantities):
+        item = items[item_number]
+        if item.stock_shards:
+            left = take_sharded_stock(db, item.id, quantities[item_number])
+        else:
+            left = decrement_stock(db, item_number, quantities[item_number])
+        if left is None:
+            db.rollback()
+            CHECKOUTS.inc("out_of_stock")
+            raise HTTPException(
+                status_code=400, detail=f"Not enough stock for {item_number}"
+            )
+        remaining[item_number] = left
+
+    subtotal = 0.0
+    order_lines: list[dict] = []
+    for item_number, quantity in quantities.items():
+        item = items[item_number]
+        unit_price = float(getattr(item, "price"))
+        line_total = unit_price * quantity
+        subtotal += line_total
+        order_lines.append(
+            {
+                "item_number": item_number,
+                "name": item.name,
+                "unit_price": unit_price,
+                "quantity": quantity,
+                "line_total": line_total,
+            }
+        )
+
+    tax = round(subtotal * TAX_RATE, 2)
+    total = round(subtotal + tax, 2)
+
+    order = Order(
+        user_id=user_id,
+        status="in_progress",
+        subtotal=subtotal,
+        tax=tax,
+        total=total,
+    )
+    db.add(order)
+    db.flush()
+
+    for line in order_lines:
+        line["order_id"] = order.id
+    db.execute(insert(OrderItem), order_lines)
+    # Same transaction as the order, so the rollups can't drift from it
+    sale_lines = [
+        (
+            items[line["item_number"]].category,
+            line["item_number"],
+            line["quantity"],
+            line["line_total"],
+        )
+        for line in order_lines
+    ]
+    record_sales(db, [(order_day(order.created_at), tax, sale_lines)])
+    bump(db, CATALOG, ALL_ORDERS, user_orders(user_id))
+
+    db.commit()
+    CHECKOUTS.inc("success")
+    for item_number, left in remaining.items():
+        publish_stock_changed(item_number, left)
+    return get_order(db, order.id)
+
+
+def set_order_status(db: Session, order_id: int, status: str) -> Order | None:
+    order = get_order(db, order_id)
+    if not order:
+        return None
+
+    user_id = order.user_id
+    setattr(order, "status", status)
+    bump(db, ALL_ORDERS, user_orders(user_id))
+    db.commit()
+    event_hub.publish(
+        "order_status_changed",
+        {"order_id": order_id, "status": status},
+        user_id=user_id,
+    )
+    return get_order(db, order_id)
+
+
+def _order_page_query(
+    stmt: Select,
+    *,
+    limit: int,
+    cursor: str | None,
+    user_id: int | None,
+    status: str | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+) -> Select:
+    if user_id is not None:
+        stmt = stmt.where(Order.user_id == user_id)
+    if status:
+        stmt = stmt.where(Order.status == status)
+    if created_from is not None:
+        stmt = stmt.where(Order.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Order.created_at < created_to)
+
+    if cursor:
+        last_created, last_id = decode_cursor(cursor, 2)
+        try:
+            last_created = datetime.fromisoformat(last_created)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        stmt = stmt.where(
+            tuple_(Order.created_at, Order.id) < tuple_(last_created, last_id)
+        )
+
+    return stmt.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1)
+
+
+def _order_page(rows: list, limit: int) -> tuple[list, str | None]:
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at.isoformat(), last.id)
+
+
+def list_orders(
+    db: Session,
+    *,
+    limit: int = 50,
+    cursor: str | None = None,
+    user_id: int | None = None,
+    status: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> tuple[list[Order], str | None]:
+    """Return one page of orders, newest first, with their lines preloaded."""
+    stmt = _order_page_query(
+        select(Order).options(selectinload(Order.items)),
+        limit=limit,
+        cursor=cursor,
+        user_id=user_id,
+        status=status,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return _order_page(list(db.scalars(stmt)), limit)
+
+
+def list_order_records(
+    db: Session,
+    *,
+    limit: int = 50,
+    cursor: str | None = None,
+    user_id: int | None = None,
+    status: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> tuple[list[OrderRecord], str | None]:
+    """Same page as list_orders, read as column rows into OrderRecords.
+
+    Lines come from a single IN query over the page's order ids.
+    """
+    stmt = _order_page_query(
+        select(
+            Order.id,
+            Order.status,
+            Order.subtotal,
+            Order.tax,
+            Order.total,
+            Order.created_at,
+        ),
+        limit=limit,
+        cursor=cursor,
+        user_id=user_id,
+        status=status,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    conn = db.connection()
+    rows, next_cursor = _order_page(conn.execute(stmt).all(), limit)
+    if not rows:
+        return [], next_cursor
+
+    orders = {row[0]: OrderRecord.from_row(row) for row in rows}
+    lines = conn.execute(
+        select(
+            OrderItem.order_id,
+            OrderItem.item_number,
+            OrderItem.name,
+            OrderItem.unit_price,
+            OrderItem.quantity,
+            OrderItem.line_total,
+        )
+        .where(OrderItem.order_id.in_(list(orders)))
+        .order_by(OrderItem.id)
+    )
+    for order_id, *line in lines:
+        orders[order_id].items.append(OrderItemRecord.from_row(line))
+    return list(orders.values()), next_cursor
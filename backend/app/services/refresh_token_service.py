@@ -0,0 +1,98 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.core.config import REFRESH_TOKEN_EXPIRE_DAYS
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+def _hash_token(raw: str) -> str:
+    # Tokens are 256 random bits, so a plain digest is enough (no bcrypt)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _new_token(db: Session, user_id: int) -> str:
+    raw = secrets.token_urlsafe(32)
+    db.add(
+        RefreshToken(
+            user_id=user_id,
+            token_hash=_hash_token(raw),
+            expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    return raw
+
+
+def issue_refresh_token(db: Session, user_id: int) -> str:
+    raw = _new_token(db, user_id)
+    db.commit()
+    return raw
+
+
+def rotate_refresh_token(db: Session, raw: str) -> tuple[str, str] | None:
+    """Exchange a refresh token for (user email, new refresh token).
+
+    Returns None if the token is unknown, expired, revoked or its user is
+    deleted.
+
+    Presenting a token that was already rotated means it leaked, so every
+    refresh token of that user is revoked.
+    """
+    row = (
+        db.query(RefreshToken, User)
+        .join(User, User.id == RefreshToken.user_id)
+        .filter(RefreshToken.token_hash == _hash_token(raw))
+        .first()
+    )
+    if not row:
+        return None
+    token, user = row
+    now = datetime.utcnow()
+
+    if token.revoked_at is not None:
+        revoke_user_refresh_tokens(db, token.user_id)
+        return None
+    if token.expires_at <= now or user.is_deleted:
+        return None
+
+    # Guarded so two concurrent refreshes with the same token can't both win
+    result = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == token.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        return None
+
+    email = user.email
+    new_raw = _new_token(db, user.id)
+    db.commit()
+    return email, new_raw
+
+
+def revoke_refresh_token(db: Session, raw: str) -> bool:
+    result = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == _hash_token(raw),
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def revoke_user_refresh_tokens(db: Session, user_id: int) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
@@ -0,0 +1,172 @@
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    REORDER_CHUNK_SIZE,
+    REORDER_HISTORY_DAYS,
+    REORDER_LEAD_TIME_DAYS,
+    REORDER_REVIEW_DAYS,
+    REORDER_SERVICE_Z,
+)
+from app.models.item import Item
+from app.models.sales_rollup import SalesDaily
+
+# Reorder suggestions for the whole catalog, computed on arrays with one
+# row per item and one column per day of history rather than item by item.
+#
+# velocity      units/day: the higher of the 7 and 28 day moving averages,
+#               so a recent spike is not averaged away
+# safety stock  z * std(daily units) * sqrt(lead time)
+# reorder point velocity * lead time + safety stock
+# reorder qty   once stock is at or below the reorder point: enough to get
+#               back to reorder point + review_days of sales, rounded up to
+#               whole qty_per_purchase packs
+
+SHORT_WINDOW = 7
+LONG_WINDOW = 28
+
+
+def _history_days() -> int:
+    return max(REORDER_HISTORY_DAYS, LONG_WINDOW)
+
+
+def load_daily_units(
+    db: Session,
+    item_numbers: np.ndarray,
+    start: date,
+    days: int,
+    chunk_size: int = REORDER_CHUNK_SIZE,
+) -> np.ndarray:
+    """Units sold per item (rows, in item_numbers order) and day (columns).
+
+    Reads the sales_daily rollups chunk_size rows at a time; each chunk is
+    turned into columns and added to the matrix in one go. item_numbers
+    must be sorted; history of items not in it is skipped.
+    """
+    units = np.zeros((len(item_numbers), days), dtype=np.int64)
+    stmt = (
+        select(SalesDaily.item_number, SalesDaily.day, SalesDaily.units)
+        .where(SalesDaily.day >= start, SalesDaily.day < start + timedelta(days))
+        .execution_options(yield_per=chunk_size)
+    )
+    origin = start.toordinal()
+    for rows in db.connection().execute(stmt).partitions():
+        numbers, days_sold, sold = zip(*rows)
+        numbers = np.array(numbers)
+        rows_idx = np.searchsorted(item_numbers, numbers)
+        rows_idx = np.minimum(rows_idx, len(item_numbers) - 1)
+        known = item_numbers[rows_idx] == numbers
+        # toordinal() is much faster than numpy's own date conversion
+        cols_idx = (
+            np.fromiter((d.toordinal() for d in days_sold), np.int64, len(rows))
+            - origin
+        )
+        np.add.at(
+            units,
+            (rows_idx[known], cols_idx[known]),
+            np.array(sold, dtype=np.int64)[known],
+        )
+    return units
+
+
+def compute_reorder(
+    units: np.ndarray,
+    stock: np.ndarray,
+    pack: np.ndarray,
+    lead_time_days: float,
+    review_days: float,
+    service_z: float = REORDER_SERVICE_Z,
+) -> dict[str, np.ndarray]:
+    """The reorder figures for every item at once (see the top of the file)."""
+    velocity = np.maximum(
+        units[:, -SHORT_WINDOW:].mean(axis=1), units[:, -LONG_WINDOW:].mean(axis=1)
+    )
+    safety_stock = np.ceil(service_z * units.std(axis=1) * np.sqrt(lead_time_days))
+    reorder_point = np.ceil(velocity * lead_time_days + safety_stock)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_of_cover = np.where(velocity > 0, stock / velocity, np.inf)
+
+    needed = (velocity > 0) & (stock <= reorder_point)
+    shortfall = np.maximum(reorder_point + velocity * review_days - stock, 0)
+    pack = np.maximum(pack, 1)
+    reorder_qty = np.where(needed, np.ceil(shortfall / pack) * pack, 0)
+
+    return {
+        "velocity": velocity,
+        "days_of_cover": days_of_cover,
+        "safety_stock": safety_stock,
+        "reorder_point": reorder_point,
+        "reorder_qty": reorder_qty,
+        "needed": needed & (reorder_qty > 0),
+    }
+
+
+def reorder_suggestions(
+    db: Session,
+    *,
+    as_of: date | None = None,
+    lead_time_days: float = REORDER_LEAD_TIME_DAYS,
+    review_days: float = REORDER_REVIEW_DAYS,
+    include_all: bool = False,
+    limit: int | None = None,
+) -> list[dict]:
+    """Items to reorder, least days of cover first.
+
+    History is the REORDER_HISTORY_DAYS full days before as_of (default:
+    today, UTC). include_all also lists items that don't need reordering.
+    """
+    as_of = as_of or datetime.now(timezone.utc).date()
+    items = db.execute(
+        select(
+            Item.item_number,
+            Item.name,
+            Item.category,
+            Item.available_stock,
+            Item.qty_per_purchase,
+        )
+    ).all()
+    if not items:
+        return []
+
+    numbers, names, categories, stock, pack = zip(*items)
+    numbers = np.array(numbers)
+    order = np.argsort(numbers)
+    numbers = numbers[order]
+    stock = np.array(stock, dtype=np.float64)[order]
+    pack = np.array(pack, dtype=np.float64)[order]
+
+    days = _history_days()
+    units = load_daily_units(db, numbers, as_of - timedelta(days), days)
+    result = compute_reorder(units, stock, pack, lead_time_days, review_days)
+
+    rows = np.arange(len(numbers))
+    if not include_all:
+        rows = rows[result["needed"]]
+    rows = rows[np.argsort(result["days_of_cover"][rows], kind="stable")]
+    if limit is not None:
+        rows = rows[:limit]
+
+    suggestions = []
+    for i in rows.tolist():
+        cover = result["days_of_cover"][i]
+        cover = round(float(cover), 1) if np.isfinite(cover) else None
+        original = order[i]
+        suggestions.append(
+            {
+                "item_number": str(numbers[i]),
+                "name": names[original],
+                "category": categories[original],
+                "qty_in_stock": int(stock[i]),
+                "qty_per_purchase": int(pack[i]),
+                "velocity": round(float(result["velocity"][i]), 3),
+                "days_of_cover": cover,
+                "safety_stock": int(result["safety_stock"][i]),
+                "reorder_point": int(result["reorder_point"][i]),
+                "reorder_qty": int(result["reorder_qty"][i]),
+            }
+        )
+    return suggestions
@@ -0,0 +1,301 @@
+import gzip
+import json
+import os
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import orjson
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Float,
+    Numeric,
+    delete,
+    func,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.orm import Session
+
+from app.core.config import SNAPSHOT_CHUNK_SIZE
+from app.core.versions import ALL_ORDERS, CATALOG, bump_all, user_orders
+from app.db.search import create_item_search_index
+from app.models.item import Item
+from app.models.item_stock_shard import ItemStockShard
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.refresh_token import RefreshToken
+from app.models.sales_rollup import SalesDaily
+from app.models.user import User
+
+# Database snapshots for cloning data into staging: a directory with a
+# manifest.json and, per table, gzipped NDJSON chunks of at most chunk_size
+# rows, each row a JSON array in manifest column order. Restores insert in
+# bulk, one transaction per chunk, with secondary indexes (and SQLite's
+# full-text triggers) created after the data is in.
+#
+# Sessions (refresh_tokens) are not copied, and sales_daily is derived:
+# rebuild it after a restore (app.scripts.rebuild_sales_rollups).
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+# Parents before children
+SNAPSHOT_TABLES = (
+    User.__table__,
+    Item.__table__,
+    ItemStockShard.__table__,
+    Order.__table__,
+    OrderItem.__table__,
+)
+
+SQLITE_FTS_TRIGGERS = ("items_fts_ai", "items_fts_ad", "items_fts_au")
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def anonymize_user(row: dict) -> dict:
+    """Replace a user's email and name with ones derived from the id, so the
+    same snapshot always anonymizes the same way."""
+    row["email"] = f"user{row['id']}@example.invalid"
+    row["full_name"] = f"User {row['id']}"
+    return row
+
+
+def alembic_revision(db: Session) -> str | None:
+    connection = db.connection()
+    if not inspect(connection).has_table("alembic_version"):
+        return None
+    return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def _chunk_name(table: str, index: int) -> str:
+    return f"{table}-{index:05d}.ndjson.gz"
+
+
+def dump_snapshot(
+    db: Session,
+    directory: str,
+    *,
+    anonymize: bool = False,
+    chunk_size: int = SNAPSHOT_CHUNK_SIZE,
+    progress=None,
+) -> dict:
+    """Write a snapshot of SNAPSHOT_TABLES into directory; returns the manifest.
+
+    Rows are read in primary key order, up to each table's highest id when
+    the dump started, so rows added meanwhile are left out. On Postgres the
+    dump also runs in one REPEATABLE READ transaction; on SQLite rows
+    updated during the dump may be seen either way, so dump a quiet
+    database.
+    """
+    os.makedirs(directory, exist_ok=True)
+    if os.path.exists(os.path.join(directory, MANIFEST)):
+        raise ValueError(f"{directory} already holds a snapshot")
+
+    dialect = db.get_bind().dialect.name
+    options = {"isolation_level": "REPEATABLE READ"} if dialect == "postgresql" else {}
+    connection = db.connection(execution_options=options)
+
+    caps = {
+        "users": connection.scalar(select(func.max(User.id))) or 0,
+        "items": connection.scalar(select(func.max(Item.id))) or 0,
+        "orders": connection.scalar(select(func.max(Order.id))) or 0,
+        "order_items": connection.scalar(select(func.max(OrderItem.id))) or 0,
+    }
+    limits = {
+        "users": User.__table__.c.id <= caps["users"],
+        "items": Item.__table__.c.id <= caps["items"],
+        "item_stock_shards": ItemStockShard.__table__.c.item_id <= caps["items"],
+        "orders": Order.__table__.c.id <= caps["orders"],
+        "order_items": (OrderItem.__table__.c.id <= caps["order_items"])
+        & (OrderItem.__table__.c.order_id <= caps["orders"]),
+    }
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source_dialect": dialect,
+        "alembic_revision": alembic_revision(db),
+        "anonymized": anonymize,
+        "tables": {},
+    }
+
+    for table in SNAPSHOT_TABLES:
+        columns = [c.name for c in table.columns]
+        stmt = (
+            select(table)
+            .where(limits[table.name])
+            .order_by(*table.primary_key.columns)
+            .execution_options(yield_per=chunk_size)
+        )
+        chunks = []
+        rows_written = 0
+        for rows in connection.execute(stmt).partitions():
+            name = _chunk_name(table.name, len(chunks))
+            with gzip.open(os.path.join(directory, name), "wb", compresslevel=5) as out:
+                for row in rows:
+                    if anonymize and table.name == "users":
+                        row = anonymize_user(dict(row._mapping))
+                        values = [row[c] for c in columns]
+                    else:
+                        values = list(row)
+                    out.write(orjson.dumps(values, default=_json_default))
+                    out.write(b"\n")
+            chunks.append(name)
+            rows_written += len(rows)
+            if progress is not None:
+                progress(table.name, rows_written)
+        manifest["tables"][table.name] = {
+            "columns": columns,
+            "rows": rows_written,
+            "chunks": chunks,
+        }
+    db.rollback()
+
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_manifest(directory: str) -> dict:
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        raise ValueError(f"No snapshot in {directory} ({MANIFEST} missing)")
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format: {manifest.get('format')}")
+    return manifest
+
+
+def _converters(table, columns: list[str]) -> list:
+    """Per column, what turns the JSON value back into a bind value."""
+    converters = []
+    for name in columns:
+        column_type = table.c[name].type
+        if isinstance(column_type, DateTime):
+            converters.append(datetime.fromisoformat)
+        elif isinstance(column_type, Date):
+            converters.append(date.fromisoformat)
+        elif isinstance(column_type, Numeric) and not isinstance(column_type, Float):
+            converters.append(Decimal)
+        else:
+            converters.append(None)
+    return converters
+
+
+def _read_chunk(path: str, columns: list[str], converters: list) -> list[dict]:
+    rows = []
+    with gzip.open(path, "rb") as f:
+        for line in f:
+            values = orjson.loads(line)
+            rows.append(
+                {
+                    name: value if convert is None or value is None else convert(value)
+                    for name, convert, value in zip(columns, converters, values)
+                }
+            )
+    return rows
+
+
+def _secondary_indexes(tables) -> list:
+    # Unique indexes stay: they are what catches a snapshot of the wrong data
+    return [index for table in tables for index in table.indexes if not index.unique]
+
+
+def _reset_sequences(db: Session, tables) -> None:
+    # Postgres: ids were inserted explicitly, so move the serials past them
+    for table in tables:
+        if "id" in table.c and table.c.id.primary_key:
+            db.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                    f"COALESCE((SELECT MAX(id) FROM {table.name}), 0) + 1, false)"
+                )
+            )
+
+
+def restore_snapshot(
+    db: Session, directory: str, *, replace: bool = False, progress=None
+) -> dict[str, int]:
+    """Load a snapshot into the database db is bound to.
+
+    The schema must already be at the snapshot's Alembic revision
+    (alembic upgrade head). The tables must be empty unless replace is
+    set, which deletes their rows first, along with the sales_daily
+    rollups and refresh tokens that belong to the old data.
+    Returns the rows restored per table.
+    """
+    manifest = read_manifest(directory)
+    target_revision = alembic_revision(db)
+    if manifest["alembic_revision"] != target_revision:
+        raise ValueError(
+            f"Snapshot is at revision {manifest['alembic_revision']}, "
+            f"the database at {target_revision}: migrate one to match"
+        )
+
+    dialect = db.get_bind().dialect.name
+    tables = [t for t in SNAPSHOT_TABLES if t.name in manifest["tables"]]
+    if replace:
+        db.execute(delete(SalesDaily))
+        db.execute(delete(RefreshToken))
+        for table in reversed(tables):
+            db.execute(delete(table))
+        db.commit()
+    else:
+        for table in tables:
+            if db.scalar(select(func.count()).select_from(table)):
+                raise ValueError(f"Table {table.name} is not empty (restore with --replace)")
+
+    connection = db.connection()
+    indexes = _secondary_indexes(tables)
+    for index in indexes:
+        index.drop(connection, checkfirst=True)
+    if dialect == "sqlite":
+        for trigger in SQLITE_FTS_TRIGGERS:
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+    db.commit()
+
+    restored = {}
+    try:
+        for table in tables:
+            entry = manifest["tables"][table.name]
+            columns = entry["columns"]
+            converters = _converters(table, columns)
+            restored[table.name] = 0
+            for name in entry["chunks"]:
+                rows = _read_chunk(os.path.join(directory, name), columns, converters)
+                if rows:
+                    db.execute(table.insert(), rows)
+                    db.commit()
+                restored[table.name] += len(rows)
+                if progress is not None:
+                    progress(table.name, restored[table.name])
+    except Exception as e:
+        db.rollback()
+        reason = getattr(e, "orig", None) or e
+        raise ValueError(
+            f"Restore failed after {sum(restored.values())} rows ({reason}); the "
+            "tables hold part of the snapshot, so retry with --replace"
+        ) from e
+    finally:
+        # Also after a failure: the database stays usable
+        db.rollback()
+        connection = db.connection()
+        for index in indexes:
+            index.create(connection, checkfirst=True)
+        # Recreates the triggers (SQLite) and indexes the restored items
+        create_item_search_index(Item.__table__, connection)
+        if dialect == "postgresql":
+            _reset_sequences(db, tables)
+        # Cached item and order lists of the old data are stale now
+        user_ids = db.scalars(select(Order.user_id).distinct())
+        bump_all(db, CATALOG, ALL_ORDERS, *(user_orders(u) for u in user_ids))
+        db.commit()
+    return restored
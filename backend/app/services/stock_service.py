@@ -0,0 +1,160 @@
+import random
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.item import Item
+from app.models.item_stock_shard import ItemStockShard
+
+# Sharded stock mode for hot items.
+#
+# A flagged item keeps its stock in Item.stock_shards rows of
+# item_stock_shards instead of items.qty_in_stock (which stays 0). A
+# checkout takes its whole quantity from a single shard, picked at random
+# among the unlocked ones that can cover it, so concurrent checkouts of the
+# same item mostly lock different rows. Every shard write is guarded by
+# qty >= amount (and a CHECK constraint), so stock can never go negative.
+# When no single shard is enough, all shards are locked, the quantity is
+# taken from the total and the remainder is spread evenly again, which
+# also keeps the fast path working.
+#
+# None of these functions commit; the caller owns the transaction.
+
+
+def _even_split(total: int, shards: int) -> list[int]:
+    base, extra = divmod(total, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+
+def sharded_total(db: Session, item_id: int) -> int:
+    return db.scalar(
+        select(func.coalesce(func.sum(ItemStockShard.qty), 0)).where(
+            ItemStockShard.item_id == item_id
+        )
+    )
+
+
+def _lock_all(db: Session, item_id: int) -> dict[int, int]:
+    # A no-op UPDATE rather than SELECT ... FOR UPDATE: SQLite ignores FOR
+    # UPDATE, and pysqlite does not even begin the transaction before the
+    # first write, so a plain read could be stale by the time we write back.
+    rows = db.execute(
+        update(ItemStockShard)
+        .where(ItemStockShard.item_id == item_id)
+        .values(qty=ItemStockShard.qty)
+        .returning(ItemStockShard.shard, ItemStockShard.qty)
+        .execution_options(synchronize_session=False)
+    ).all()
+    return dict(sorted(rows))
+
+
+def _create_shards(db: Session, item_id: int, shards: int, total: int) -> None:
+    db.execute(
+        insert(ItemStockShard),
+        [
+            {"item_id": item_id, "shard": i, "qty": qty}
+            for i, qty in enumerate(_even_split(total, shards))
+        ],
+    )
+
+
+def _respread(db: Session, item_id: int, shards: list[int], total: int) -> None:
+    """Rewrite already locked shards so they hold total between them."""
+    table = ItemStockShard.__table__
+    db.execute(
+        table.update()
+        .where(table.c.item_id == item_id, table.c.shard == bindparam("b_shard"))
+        .values(qty=bindparam("b_qty")),
+        [
+            {"b_shard": shard, "b_qty": qty}
+            for shard, qty in zip(shards, _even_split(total, len(shards)))
+        ],
+    )
+
+
+def take_sharded_stock(db: Session, item_id: int, quantity: int) -> int | None:
+    """Sharded counterpart of item_service.decrement_stock.
+
+    Returns the stock left afterwards, or None (changing nothing) when less
+    than quantity is available.
+    """
+    # Fast path: one unlocked shard that covers the whole quantity
+    shard = db.scalar(
+        select(ItemStockShard.shard)
+        .where(ItemStockShard.item_id == item_id, ItemStockShard.qty >= quantity)
+        .order_by(func.random())
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if shard is not None:
+        result = db.execute(
+            update(ItemStockShard)
+            .where(
+                ItemStockShard.item_id == item_id,
+                ItemStockShard.shard == shard,
+                ItemStockShard.qty >= quantity,
+            )
+            .values(qty=ItemStockShard.qty - quantity)
+        )
+        if result.rowcount == 1:
+            return sharded_total(db, item_id)
+
+    # Slow path: take it from the total and rebalance
+    current = _lock_all(db, item_id)
+    total = sum(current.values())
+    if not current or total < quantity:
+        return None
+    _respread(db, item_id, list(current), total - quantity)
+    return total - quantity
+
+
+def add_sharded_stock(db: Session, item_id: int, shards: int, quantity: int) -> int:
+    """Put quantity (> 0) back into a random shard; returns the new total."""
+    db.execute(
+        update(ItemStockShard)
+        .where(
+            ItemStockShard.item_id == item_id,
+            ItemStockShard.shard == random.randrange(shards),
+        )
+        .values(qty=ItemStockShard.qty + quantity)
+    )
+    return sharded_total(db, item_id)
+
+
+def set_sharded_stock(db: Session, item_id: int, total: int) -> None:
+    """Replace the stock of a sharded item, spread evenly over its shards."""
+    current = _lock_all(db, item_id)
+    if current:
+        _respread(db, item_id, list(current), total)
+
+
+def set_stock_shards(db: Session, item: Item, shards: int) -> None:
+    """Switch item to shards stock shards (0 = plain qty_in_stock).
+
+    The total is preserved. A checkout racing with the switch fails its
+    guarded update (the old stock is already 0 or gone) instead of
+    overselling.
+    """
+    # Locked and read in one statement, for the same reason as _lock_all
+    current_shards, total = db.execute(
+        update(Item)
+        .where(Item.id == item.id)
+        .values(stock_shards=Item.stock_shards)
+        .returning(Item.stock_shards, Item.qty_in_stock)
+        .execution_options(synchronize_session=False)
+    ).one()
+    if current_shards:
+        total = sum(_lock_all(db, item.id).values())
+        db.execute(delete(ItemStockShard).where(ItemStockShard.item_id == item.id))
+
+    if shards:
+        _create_shards(db, item.id, shards, total)
+        values = {"stock_shards": shards, "qty_in_stock": 0}
+    else:
+        values = {"stock_shards": 0, "qty_in_stock": total}
+    db.execute(
+        update(Item)
+        .where(Item.id == item.id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
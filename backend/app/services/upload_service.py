@@ -0,0 +1,113 @@
+import hashlib
+import os
+import uuid
+
+import aiofiles
+import aiofiles.os
+from fastapi import HTTPException, Request, UploadFile
+from fastapi.routing import APIRoute
+
+from app.core.config import MAX_UPLOAD_BYTES, UPLOADS_DIR, UPLOADS_TMP_DIR
+
+CHUNK_SIZE = 64 * 1024
+# Room for the multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413, detail=f"Image larger than {MAX_UPLOAD_BYTES} bytes"
+    )
+
+
+class UploadLimitRoute(APIRoute):
+    """Route whose request body may be at most MAX_UPLOAD_BYTES plus
+    multipart overhead.
+
+    FastAPI receives the whole form, spooling files to disk, before the
+    endpoint runs, so store_image's own check would only come after an
+    oversized upload was fully received. This one refuses a too large
+    Content-Length up front and stops a chunked body once it passes the
+    limit.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        limit = MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+
+        async def limited_handler(request: Request):
+            length = request.headers.get("content-length")
+            if length is not None and (not length.isdigit() or int(length) > limit):
+                raise _too_large()
+
+            receive = request.receive
+            received = 0
+
+            async def limited_receive():
+                nonlocal received
+                message = await receive()
+                if message["type"] == "http.request":
+                    received += len(message.get("body", b""))
+                    if received > limit:
+                        raise _too_large()
+                return message
+
+            request._receive = limited_receive
+            return await handler(request)
+
+        return limited_handler
+
+
+def sniff_image_type(head: bytes) -> str | None:
+    """Return the file extension for head's magic bytes, or None."""
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+async def store_image(file: UploadFile) -> str:
+    """Stream an uploaded image into UPLOADS_DIR under its SHA-256 name.
+
+    Returns the stored filename. Identical content maps to the same file,
+    so re-uploading an image reuses the copy already on disk.
+    """
+    await aiofiles.os.makedirs(UPLOADS_DIR, exist_ok=True)
+    await aiofiles.os.makedirs(UPLOADS_TMP_DIR, exist_ok=True)
+    tmp_path = os.path.join(UPLOADS_TMP_DIR, f"upload-{uuid.uuid4().hex}.part")
+
+    digest = hashlib.sha256()
+    size = 0
+    ext = None
+    try:
+        async with aiofiles.open(tmp_path, "wb") as out:
+            while chunk := await file.read(CHUNK_SIZE):
+                if ext is None:
+                    ext = sniff_image_type(chunk)
+                    if ext is None:
+                        raise HTTPException(
+                            status_code=400, detail="Unsupported image type"
+                        )
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise _too_large()
+                digest.update(chunk)
+                await out.write(chunk)
+
+        if ext is None:
+            raise HTTPException(status_code=400, detail="Empty upload")
+
+        filename = f"{digest.hexdigest()}{ext}"
+        path = os.path.join(UPLOADS_DIR, filename)
+        if await aiofiles.os.path.exists(path):
+            await aiofiles.os.remove(tmp_path)
+        else:
+            await aiofiles.os.replace(tmp_path, path)
+        return filename
+    except BaseException:
+        if await aiofiles.os.path.exists(tmp_path):
+            await aiofiles.os.remove(tmp_path)
+        raise
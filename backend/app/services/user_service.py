@@ -2,12 +2,15 @@ from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.core.security import hash_password
+from app.core.auth_cache import invalidate_user
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from datetime import datetime
 
 
-def create_user(db: Session, user_in: UserCreate) -> User:
+def create_user(
+    db: Session, user_in: UserCreate, hashed_password: str | None = None
+) -> User:
     existing = db.query(User).filter(User.email == user_in.email).first()
     if existing and existing.is_deleted:
         raise HTTPException(409, "Account is deactivated. Contact support.")
@@ -17,7 +20,7 @@ def create_user(db: Session, user_in: UserCreate) -> User:
     user = User(
         email=user_in.email,
         full_name=user_in.full_name,
-        hashed_password=hash_password(user_in.password),
+        hashed_password=hashed_password or hash_password(user_in.password),
         role="shop",
     )
 
@@ -41,6 +44,19 @@ def get_users(
     return q.offset(skip).limit(limit).all()
 
 
+def change_user_role(db: Session, email: str, role: str) -> User | None:
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        return None
+
+    # hard safety: you can keep this or remove it
+    # prevents accidentally demoting your only admin, etc.
+    user.role = role
+    db.commit()
+    invalidate_user(user.email)
+    return user
+
+
 def delete_user(db: Session, user_id: int) -> bool:
     user = (
         db.query(User).filter(User.id == user_id, User.is_deleted == False).first()
@@ -50,4 +66,5 @@ def delete_user(db: Session, user_id: int) -> bool:
     user.is_deleted = True
     user.deleted_at = datetime.utcnow()
     db.commit()
+    invalidate_user(user.email)
     return True
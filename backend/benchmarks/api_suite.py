@@ -0,0 +1,692 @@
+"""API benchmark suite on a large synthetic catalog.
+
+Drives the FastAPI app in-process (httpx ASGITransport) against a seeded
+SQLite database and times, at a fixed concurrency:
+
+  items_list        GET  /api/v1/items/ (first pages, via X-Next-Cursor)
+  users_me          GET  /api/v1/users/me
+  login             POST /api/v1/auth/login (bcrypt bound)
+  orders_list       GET  /api/v1/orders/ as admin (first pages)
+  orders_me         GET  /api/v1/orders/me
+  checkout          POST /api/v1/orders/checkout, random items
+  checkout_hot_sku  concurrent checkouts of one SKU with --hot-stock units;
+                    fails unless exactly that many succeed
+  image_upload      POST /api/v1/items/{item_number}/image
+
+Each scenario reports p50/p95/p99 latency, throughput and the process's
+peak RSS so far; the whole run goes to JSON. With --baseline, the run is
+compared to an earlier result and exits with status 1 when a scenario got
+slower (or the process bigger) by more than --tolerance.
+
+The dataset is generated from --seed, so the same arguments give the same
+database. It is built once, in a separate process, and cached under
+--cache-dir; every run works on a fresh copy. The default 10k items, 100k
+users and 1M orders (about 400 MB) takes a minute or two to build.
+
+    cd backend
+    python -m benchmarks.api_suite --output bench.json
+    python -m benchmarks.api_suite --baseline bench.json --tolerance 0.2
+    python -m benchmarks.api_suite --items 2000 --users 1000 --orders 20000
+
+Set DB_MODE / PASSWORD_HASH_WORKERS / IMAGE_WORKERS as for the server.
+Needs httpx, which is not a runtime dependency.
+"""
+
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+PASSWORD = "bench-password"
+ADMIN_EMAIL = "admin@bench.example"
+HOT_SKU = "BENCH-HOT"
+CATEGORIES = (
+    "Office Supplies",
+    "Electronics",
+    "Furniture",
+    "Cleaning",
+    "Breakroom",
+    "Packaging",
+    "Safety",
+    "Tools",
+)
+ORDER_STATUSES = ("in_progress", "shipped", "complete")
+SEED_CHUNK = 50_000
+
+SCENARIOS = (
+    "items_list",
+    "users_me",
+    "login",
+    "orders_list",
+    "orders_me",
+    "checkout",
+    "checkout_hot_sku",
+    "image_upload",
+)
+
+
+def _email(user_id: int) -> str:
+    return ADMIN_EMAIL if user_id == 1 else f"user{user_id}@bench.example"
+
+
+def _item_number(i: int) -> str:
+    return f"BENCH-{i:06d}"
+
+
+# --- dataset
+
+
+def _seed_database(path: str, items: int, users: int, orders: int, seed: int):
+    """Build the benchmark database at path (run in a child process)."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+
+    from sqlalchemy import insert
+
+    from app.core.security import hash_password
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.models.item import Item
+    from app.models.order import Order
+    from app.models.order_item import OrderItem
+    from app.models.user import User
+
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+    hashed = hash_password(PASSWORD)
+
+    with engine.begin() as conn:
+        for start in range(1, users + 1, SEED_CHUNK):
+            conn.execute(
+                insert(User),
+                [
+                    {
+                        "email": _email(user_id),
+                        "full_name": f"Bench User {user_id}",
+                        "hashed_password": hashed,
+                        "role": "admin" if user_id == 1 else "shop",
+                    }
+                    for user_id in range(start, min(start + SEED_CHUNK, users + 1))
+                ],
+            )
+
+        prices = [round(rng.uniform(0.5, 200), 2) for _ in range(items)]
+        for start in range(0, items, SEED_CHUNK):
+            conn.execute(
+                insert(Item),
+                [
+                    {
+                        "item_number": _item_number(i),
+                        "name": f"Item {i}",
+                        "description": f"Benchmark item {i} " * 4,
+                        "qty_per_purchase": rng.choice((1, 1, 1, 6, 12)),
+                        "qty_in_stock": rng.randint(10_000, 100_000),
+                        "price": prices[i],
+                        "category": CATEGORIES[i % len(CATEGORIES)],
+                        "subcategory": f"Group {i % 40}",
+                    }
+                    for i in range(start, min(start + SEED_CHUNK, items))
+                ],
+            )
+        conn.execute(
+            insert(Item),
+            [
+                {
+                    "item_number": HOT_SKU,
+                    "name": "Hot item",
+                    "description": "Bought by everyone at once",
+                    "qty_per_purchase": 1,
+                    "qty_in_stock": 0,
+                    "price": 9.99,
+                    "category": CATEGORIES[0],
+                }
+            ],
+        )
+
+    # A year of orders, oldest first, spread evenly
+    first = datetime(2025, 1, 1)
+    step = timedelta(days=365) / max(orders, 1)
+    for start in range(1, orders + 1, SEED_CHUNK):
+        order_rows = []
+        line_rows = []
+        for order_id in range(start, min(start + SEED_CHUNK, orders + 1)):
+            subtotal = 0.0
+            for i in rng.sample(range(items), min(rng.randint(1, 4), items)):
+                quantity = rng.randint(1, 5)
+                line_total = round(prices[i] * quantity, 2)
+                subtotal += line_total
+                line_rows.append(
+                    {
+                        "order_id": order_id,
+                        "item_number": _item_number(i),
+                        "name": f"Item {i}",
+                        "unit_price": prices[i],
+                        "quantity": quantity,
+                        "line_total": line_total,
+                    }
+                )
+            tax = round(subtotal * 0.0825, 2)
+            order_rows.append(
+                {
+                    "id": order_id,
+                    "user_id": rng.randint(2, users) if users > 1 else 1,
+                    "status": rng.choices(ORDER_STATUSES, (1, 2, 7))[0],
+                    "subtotal": round(subtotal, 2),
+                    "tax": tax,
+                    "total": round(subtotal + tax, 2),
+                    "created_at": first + step * (order_id - 1),
+                }
+            )
+        with engine.begin() as conn:
+            conn.execute(insert(Order), order_rows)
+            conn.execute(insert(OrderItem), line_rows)
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    engine.dispose()
+
+
+def _dataset_path(args) -> str:
+    name = f"bench-i{args.items}-u{args.users}-o{args.orders}-s{args.seed}.db"
+    return os.path.join(args.cache_dir, name)
+
+
+def _ensure_dataset(args) -> str:
+    path = _dataset_path(args)
+    if os.path.exists(path) and not args.reseed:
+        return path
+
+    os.makedirs(args.cache_dir, exist_ok=True)
+    partial = f"{path}.part"
+    for leftover in (partial, f"{partial}-wal", f"{partial}-shm"):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+
+    print(f"Seeding {path} ...", file=sys.stderr)
+    started = time.perf_counter()
+    # A separate process, so seeding does not count towards peak RSS
+    process = multiprocessing.get_context("spawn").Process(
+        target=_seed_database,
+        args=(partial, args.items, args.users, args.orders, args.seed),
+    )
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise SystemExit(f"Seeding failed (exit code {process.exitcode})")
+    os.replace(partial, path)
+    print(f"Seeded in {time.perf_counter() - started:.0f}s", file=sys.stderr)
+    return path
+
+
+def _copy_dataset(path: str) -> str:
+    fd, run_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    # sqlite3's backup copies a consistent snapshot even with a WAL around
+    source, target = sqlite3.connect(path), sqlite3.connect(run_path)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+    return run_path
+
+
+# --- measuring
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def _run_scenario(
+    send, requests: int, concurrency: int, expected=(200,), warmup: int = 0
+) -> dict:
+    """Call send(i) for i in range(requests) from concurrency workers.
+
+    send returns an httpx response; statuses outside expected count as
+    errors. The first warmup calls are made before the clock starts.
+    """
+    for i in range(warmup):
+        await send(i)
+
+    counter = itertools.count()
+    samples: list[float] = []
+    statuses: dict[int, int] = {}
+
+    async def worker():
+        while (i := next(counter)) < requests:
+            started = time.perf_counter()
+            response = await send(i)
+            samples.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, requests)))))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(samples),
+        "concurrency": concurrency,
+        "p50_ms": round(_percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(_percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(_percentile(samples, 99) * 1000, 2),
+        "max_ms": round(max(samples, default=0) * 1000, 2),
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "errors": sum(n for code, n in statuses.items() if code not in expected),
+        "status_counts": {str(code): n for code, n in sorted(statuses.items())},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def _login(client, email: str) -> dict:
+    r = await client.post(
+        "/api/v1/auth/login", data={"username": email, "password": PASSWORD}
+    )
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def _cursors(client, path: str, headers: dict, pages: int) -> list:
+    """Cursors for the first pages of a keyset-paginated list (None: page 1)."""
+    cursors = [None]
+    while len(cursors) < pages:
+        params = {"limit": 50}
+        if cursors[-1] is not None:
+            params["cursor"] = cursors[-1]
+        r = await client.get(path, params=params, headers=headers)
+        r.raise_for_status()
+        next_cursor = r.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        cursors.append(next_cursor)
+    return cursors
+
+
+def _page_request(client, path: str, headers: dict, cursors: list):
+    def send(i):
+        params = {"limit": 50}
+        if cursors[i % len(cursors)] is not None:
+            params["cursor"] = cursors[i % len(cursors)]
+        return client.get(path, params=params, headers=headers)
+
+    return send
+
+
+def _png(index: int) -> bytes:
+    from PIL import Image
+
+    image = Image.new("RGB", (640, 480), ((index * 37) % 256, (index * 91) % 256, 128))
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _variant_paths(filename: str) -> list[str]:
+    from app.core.config import UPLOADS_DIR
+    from app.core.image_variants import (
+        IMAGE_VARIANT_FORMATS,
+        IMAGE_VARIANT_SIZES,
+        variant_filename,
+    )
+
+    return [
+        os.path.join(UPLOADS_DIR, variant_filename(filename, variant, fmt))
+        for variant in IMAGE_VARIANT_SIZES
+        for fmt in IMAGE_VARIANT_FORMATS
+    ]
+
+
+def _remove_uploads(filenames: set[str], timeout: float = 60.0) -> None:
+    """Delete the benchmark's uploads once their variants have been written."""
+    from app.core.config import UPLOADS_DIR
+
+    paths = [os.path.join(UPLOADS_DIR, name) for name in filenames]
+    for name in filenames:
+        paths.extend(_variant_paths(name))
+    deadline = time.monotonic() + timeout
+    while not all(map(os.path.exists, paths)) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+async def _run(args) -> dict:
+    import httpx
+    from sqlalchemy import select, update
+
+    from app.core.config import UPLOADS_DIR
+    from app.core.security import shutdown_password_hasher
+    from app.db.session import SessionLocal
+    from app.main import app
+    from app.models.item import Item
+    from app.services.image_service import shutdown_image_workers
+
+    rng = random.Random(args.seed)
+    shoppers = min(args.shop_users, args.users - 1)
+    user_ids = rng.sample(range(2, args.users + 1), shoppers)
+    n = args.requests
+    results = {}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        admin = await _login(client, ADMIN_EMAIL)
+        shops = [await _login(client, _email(user_id)) for user_id in user_ids]
+        selected = [name for name in SCENARIOS if name in args.scenarios]
+
+        for name in selected:
+            print(f"{name} ...", file=sys.stderr)
+            if name == "items_list":
+                cursors = await _cursors(client, "/api/v1/items/", {}, args.pages)
+                send = _page_request(client, "/api/v1/items/", {}, cursors)
+                result = await _run_scenario(send, n, args.concurrency, warmup=5)
+
+            elif name == "users_me":
+                result = await _run_scenario(
+                    lambda i: client.get(
+                        "/api/v1/users/me", headers=shops[i % len(shops)]
+                    ),
+                    n,
+                    args.concurrency,
+                    warmup=5,
+                )
+
+            elif name == "login":
+                result = await _run_scenario(
+                    lambda i: client.post(
+                        "/api/v1/auth/login",
+                        data={
+                            "username": _email(user_ids[i % len(user_ids)]),
+                            "password": PASSWORD,
+                        },
+                    ),
+                    args.login_requests,
+                    args.concurrency,
+                    warmup=2,
+                )
+
+            elif name == "orders_list":
+                cursors = await _cursors(client, "/api/v1/orders/", admin, args.pages)
+                send = _page_request(client, "/api/v1/orders/", admin, cursors)
+                result = await _run_scenario(send, n, args.concurrency, warmup=5)
+
+            elif name == "orders_me":
+                result = await _run_scenario(
+                    lambda i: client.get(
+                        "/api/v1/orders/me",
+                        params={"limit": 50},
+                        headers=shops[i % len(shops)],
+                    ),
+                    n,
+                    args.concurrency,
+                    warmup=5,
+                )
+
+            elif name == "checkout":
+                picks = [rng.randrange(args.items) for _ in range(n)]
+                result = await _run_scenario(
+                    lambda i: client.post(
+                        "/api/v1/orders/checkout",
+                        json={
+                            "lines": [
+                                {"item_number": _item_number(picks[i]), "quantity": 1}
+                            ]
+                        },
+                        headers=shops[i % len(shops)],
+                    ),
+                    n,
+                    args.concurrency,
+                )
+
+            elif name == "checkout_hot_sku":
+                with SessionLocal() as db:
+                    db.execute(
+                        update(Item)
+                        .where(Item.item_number == HOT_SKU)
+                        .values(qty_in_stock=args.hot_stock)
+                    )
+                    db.commit()
+                if args.hot_shards:
+                    r = await client.put(
+                        f"/api/v1/items/{HOT_SKU}/stock-shards",
+                        json={"shards": args.hot_shards},
+                        headers=admin,
+                    )
+                    r.raise_for_status()
+                # Twice the stock: half of the checkouts must sell out
+                result = await _run_scenario(
+                    lambda i: client.post(
+                        "/api/v1/orders/checkout",
+                        json={"lines": [{"item_number": HOT_SKU, "quantity": 1}]},
+                        headers=shops[i % len(shops)],
+                    ),
+                    args.hot_stock * 2,
+                    args.hot_concurrency,
+                    expected=(200, 400),
+                )
+                with SessionLocal() as db:
+                    left = db.scalar(
+                        select(Item.available_stock).where(Item.item_number == HOT_SKU)
+                    )
+                sold = result["status_counts"].get("200", 0)
+                result["stock_shards"] = args.hot_shards
+                result["sold"] = sold
+                result["stock_left"] = left
+                result["consistent"] = sold == args.hot_stock and left == 0
+
+            elif name == "image_upload":
+                images = [_png(i) for i in range(args.images)]
+                before = set(os.listdir(UPLOADS_DIR))
+                picks = [_item_number(rng.randrange(args.items)) for _ in range(n)]
+                result = await _run_scenario(
+                    lambda i: client.post(
+                        f"/api/v1/items/{picks[i]}/image",
+                        files={"file": ("bench.png", images[i % len(images)])},
+                        headers=admin,
+                    ),
+                    n,
+                    args.concurrency,
+                )
+                uploaded = {
+                    name
+                    for name in set(os.listdir(UPLOADS_DIR)) - before
+                    if name.endswith(".png")
+                }
+                _remove_uploads(uploaded)
+
+            results[name] = result
+
+    shutdown_password_hasher()
+    shutdown_image_workers()
+    return results
+
+
+# --- reporting
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _dataset(args) -> dict:
+    return {
+        "items": args.items,
+        "users": args.users,
+        "orders": args.orders,
+        "seed": args.seed,
+    }
+
+
+def failures(report: dict) -> list[str]:
+    """Problems that fail a run whatever the baseline says."""
+    found = []
+    for name, result in report["scenarios"].items():
+        if result["errors"]:
+            found.append(
+                f"{name}: {result['errors']} unexpected responses "
+                f"{result['status_counts']}"
+            )
+        if result.get("consistent") is False:
+            found.append(
+                f"{name}: sold {result['sold']} of {report['hot_stock']} "
+                f"with {result['stock_left']} left"
+            )
+    return found
+
+
+def regressions(
+    report: dict, baseline: dict, tolerance: float, min_delta_ms: float
+) -> list[str]:
+    """Where report is worse than baseline by more than tolerance.
+
+    Latencies must also be worse by min_delta_ms, so that noise on
+    sub-millisecond timings does not fail a run.
+    """
+    if report["dataset"] != baseline.get("dataset"):
+        return [
+            f"dataset differs from the baseline: {report['dataset']} vs "
+            f"{baseline.get('dataset')}"
+        ]
+
+    found = []
+    for name, result in report["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if (
+                result[key] > base[key] * (1 + tolerance)
+                and result[key] - base[key] > min_delta_ms
+            ):
+                found.append(f"{name}: {key} {base[key]} -> {result[key]}")
+        if result["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            found.append(
+                f"{name}: throughput_rps {base['throughput_rps']} -> "
+                f"{result['throughput_rps']}"
+            )
+
+    peak, base_peak = report.get("peak_rss_mb"), baseline.get("peak_rss_mb")
+    if peak and base_peak and peak > base_peak * (1 + tolerance):
+        found.append(f"peak_rss_mb {base_peak} -> {peak}")
+    return found
+
+
+def main(args) -> int:
+    dataset = _ensure_dataset(args)
+    run_path = _copy_dataset(dataset)
+    # Before anything imports app.db.session
+    os.environ["DATABASE_URL"] = f"sqlite:///{run_path}"
+    try:
+        scenarios = asyncio.run(_run(args))
+    finally:
+        for path in (run_path, f"{run_path}-wal", f"{run_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "db_mode": os.getenv("DB_MODE", "sync"),
+        "password_hash_workers": os.getenv("PASSWORD_HASH_WORKERS", "default"),
+        "dataset": _dataset(args),
+        "hot_stock": args.hot_stock,
+        "peak_rss_mb": peak_rss_mb(),
+        "scenarios": scenarios,
+    }
+    body = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as out:
+            out.write(body + "\n")
+    else:
+        print(body)
+
+    problems = failures(report)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        problems += regressions(report, baseline, args.tolerance, args.min_delta_ms)
+    for problem in problems:
+        print(f"FAIL {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    data = parser.add_argument_group("dataset")
+    data.add_argument("--items", type=int, default=10_000)
+    data.add_argument("--users", type=int, default=100_000)
+    data.add_argument("--orders", type=int, default=1_000_000)
+    data.add_argument("--seed", type=int, default=1)
+    data.add_argument(
+        "--cache-dir",
+        default=os.path.join(tempfile.gettempdir(), "inventory-benchmarks"),
+    )
+    data.add_argument("--reseed", action="store_true", help="rebuild the dataset")
+
+    load = parser.add_argument_group("load")
+    load.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=SCENARIOS,
+        default=list(SCENARIOS),
+    )
+    load.add_argument("--requests", type=int, default=500, help="per scenario")
+    load.add_argument("--login-requests", type=int, default=50)
+    load.add_argument("--concurrency", type=int, default=8)
+    load.add_argument("--shop-users", type=int, default=20)
+    load.add_argument("--pages", type=int, default=20, help="list pages to cycle")
+    load.add_argument("--hot-stock", type=int, default=200)
+    load.add_argument("--hot-concurrency", type=int, default=32)
+    load.add_argument("--hot-shards", type=int, default=0)
+    load.add_argument("--images", type=int, default=8, help="distinct images")
+
+    check = parser.add_argument_group("output and regression check")
+    check.add_argument("--output", help="write the JSON report here")
+    check.add_argument("--baseline", help="an earlier report to compare against")
+    check.add_argument("--tolerance", type=float, default=0.25)
+    check.add_argument("--min-delta-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    if args.users < 2:
+        parser.error("--users must be at least 2 (an admin and a shopper)")
+    if args.items < 1:
+        parser.error("--items must be at least 1")
+    sys.exit(main(args))
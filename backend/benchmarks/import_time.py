@@ -0,0 +1,93 @@
+"""Import-time budget for app.main.
+
+Imports app.main in fresh interpreters (python -X importtime) and fails
+(exit status 1) when the fastest run is over --budget-ms, or when any of
+LAZY_MODULES was imported: those load on first use, and a new top-level
+import of one of them is the usual way cold starts get slow again.
+
+    cd backend
+    python -m benchmarks.import_time --budget-ms 1500
+
+Prints a JSON report with the slowest modules by cumulative time.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Loaded on first use (bcrypt, JWTs, images, reorder maths) or, for
+# Alembic, only by the migration tooling
+LAZY_MODULES = ("passlib", "bcrypt", "jose", "cryptography", "PIL", "numpy", "alembic")
+
+PROBE = (
+    "import json, sys; import app.main; "
+    "print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})))"
+)
+
+
+def _import_once() -> tuple[float, list[tuple[str, float]], set[str]]:
+    """Seconds to import app.main, (module, cumulative seconds) for every
+    module, and the top-level packages that ended up imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules.append((name.strip(), int(cumulative) / 1e6))
+    total = next(seconds for name, seconds in modules if name == "app.main")
+    return total, modules, set(json.loads(result.stdout))
+
+
+def main(args) -> int:
+    runs = [_import_once() for _ in range(args.runs)]
+    best_total, modules, imported = min(runs, key=lambda run: run[0])
+
+    slowest = sorted(
+        (m for m in modules if m[0] != "app.main"), key=lambda m: m[1], reverse=True
+    )[: args.top]
+    eager = sorted(set(LAZY_MODULES) & imported)
+    report = {
+        "import_ms": round(best_total * 1000, 1),
+        "runs_ms": [round(run[0] * 1000, 1) for run in runs],
+        "budget_ms": args.budget_ms,
+        "eagerly_imported": eager,
+        "slowest": [
+            {"module": name, "cumulative_ms": round(seconds * 1000, 1)}
+            for name, seconds in slowest
+        ],
+    }
+    print(json.dumps(report, indent=2))
+
+    failed = False
+    if best_total * 1000 > args.budget_ms:
+        print(
+            f"FAIL importing app.main took {best_total * 1000:.0f} ms "
+            f"(budget {args.budget_ms:.0f} ms)",
+            file=sys.stderr,
+        )
+        failed = True
+    for name in eager:
+        print(f"FAIL {name} is imported by app.main; import it lazily", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("IMPORT_BUDGET_MS", "1500")),
+    )
+    parser.add_argument("--runs", type=int, default=3, help="fastest one counts")
+    parser.add_argument("--top", type=int, default=15)
+    sys.exit(main(parser.parse_args()))
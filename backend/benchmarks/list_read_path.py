@@ -0,0 +1,184 @@
+"""ORM + Pydantic vs Core rows + orjson for the list endpoints.
+
+Builds a throwaway SQLite database, then times one page of GET /items/ and
+GET /orders/ work both ways, query through JSON bytes:
+
+  orm:  list_items / list_orders, validated through ItemRead / OrderRead
+        (what response_model did) and dumped by Pydantic
+  lean: list_item_records / list_order_records dumped by orjson
+
+It also checks that both paths produce byte-identical JSON.
+
+    cd backend
+    python -m benchmarks.list_read_path --items 5000 --orders 2000 --limit 500
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def _setup_database() -> str:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return path
+
+
+def _seed(db, items: int, orders: int) -> None:
+    from sqlalchemy import insert
+
+    from app.models.item import Item
+    from app.models.order import Order
+    from app.models.order_item import OrderItem
+    from app.models.user import User
+
+    rng = random.Random(14)
+    db.add(User(email="bench@example.com", full_name="Bench", hashed_password="x"))
+    db.flush()
+
+    db.execute(
+        insert(Item),
+        [
+            {
+                "item_number": f"BENCH-{i}",
+                "name": f"Item {i}",
+                "description": "benchmark item " * 4,
+                "qty_per_purchase": 1,
+                "qty_in_stock": rng.randint(0, 500),
+                "price": round(rng.uniform(0.5, 200), 2),
+                "image_url": f"/static/uploads/{i:064x}.png" if i % 2 else None,
+                "category": "Office Supplies",
+                "subcategory": "Paper" if i % 3 else None,
+            }
+            for i in range(items)
+        ],
+    )
+
+    start = datetime(2024, 1, 1)
+    order_rows = []
+    line_rows = []
+    for order_id in range(1, orders + 1):
+        order_rows.append(
+            {
+                "id": order_id,
+                "user_id": 1,
+                "status": "in_progress",
+                "subtotal": 10,
+                "tax": 0.83,
+                "total": 10.83,
+                "created_at": start + timedelta(minutes=order_id, microseconds=order_id),
+            }
+        )
+        for line in range(rng.randint(1, 5)):
+            line_rows.append(
+                {
+                    "order_id": order_id,
+                    "item_number": f"BENCH-{line}",
+                    "name": f"Item {line}",
+                    "unit_price": 2.5,
+                    "quantity": 4,
+                    "line_total": 10,
+                }
+            )
+    if order_rows:
+        db.execute(insert(Order), order_rows)
+        db.execute(insert(OrderItem), line_rows)
+    db.commit()
+
+
+def _time(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return {
+        "p50_ms": round(statistics.median(samples) * 1000, 2),
+        "min_ms": round(min(samples) * 1000, 2),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2),
+    }
+
+
+def main(args) -> dict:
+    from pydantic import TypeAdapter
+
+    from app.core.responses import FastJSONResponse
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.schemas.items import ItemRead
+    from app.schemas.orders import OrderRead
+    from app.services.item_service import list_item_records, list_items
+    from app.services.order_service import list_order_records, list_orders
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    _seed(db, args.items, args.orders)
+
+    items_adapter = TypeAdapter(list[ItemRead])
+    orders_adapter = TypeAdapter(list[OrderRead])
+
+    def orm_items() -> bytes:
+        rows, _ = list_items(db, limit=args.limit)
+        body = items_adapter.dump_json(items_adapter.validate_python(rows))
+        db.expunge_all()
+        return body
+
+    def lean_items() -> bytes:
+        rows, _ = list_item_records(db, limit=args.limit)
+        return FastJSONResponse(rows).body
+
+    def orm_orders() -> bytes:
+        rows, _ = list_orders(db, limit=args.order_limit)
+        body = orders_adapter.dump_json(orders_adapter.validate_python(rows))
+        db.expunge_all()
+        return body
+
+    def lean_orders() -> bytes:
+        rows, _ = list_order_records(db, limit=args.order_limit)
+        return FastJSONResponse(rows).body
+
+    results = {}
+    for name, orm, lean in (
+        ("items", orm_items, lean_items),
+        ("orders", orm_orders, lean_orders),
+    ):
+        identical = orm() == lean()
+        orm_stats = _time(orm, args.repeat)
+        lean_stats = _time(lean, args.repeat)
+        results[name] = {
+            "identical_json": identical,
+            "orm": orm_stats,
+            "lean": lean_stats,
+            "speedup_p50": round(orm_stats["p50_ms"] / lean_stats["p50_ms"], 2),
+        }
+
+    db.close()
+    return {
+        "items": args.items,
+        "orders": args.orders,
+        "item_page": args.limit,
+        "order_page": args.order_limit,
+        **results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--order-limit", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    db_path = _setup_database()
+    try:
+        print(json.dumps(main(args), indent=2))
+    finally:
+        os.remove(db_path)
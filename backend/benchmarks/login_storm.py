@@ -0,0 +1,151 @@
+"""Mixed-traffic latency during a login storm.
+
+Drives the FastAPI app in-process (httpx ASGITransport) against a throwaway
+SQLite database. A steady stream of GET /api/v1/items/ requests is timed
+twice: once on its own and once while a burst of concurrent logins runs.
+
+    cd backend
+    python -m benchmarks.login_storm --logins 200 --readers 8
+
+Compare password-hashing modes by setting PASSWORD_HASH_WORKERS, e.g.
+PASSWORD_HASH_WORKERS=0 (threadpool, the old behaviour) vs the default
+process pool. Needs httpx, which is not a runtime dependency.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+
+def _setup_database() -> str:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return path
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summary(samples: list[float]) -> dict:
+    return {
+        "count": len(samples),
+        "p50_ms": round(_percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(_percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(_percentile(samples, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2) if samples else 0.0,
+    }
+
+
+async def _reader(client, stop: asyncio.Event, samples: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        r = await client.get("/api/v1/items/", params={"limit": 50})
+        samples.append(time.perf_counter() - started)
+        r.raise_for_status()
+
+
+async def _login(client, email: str, password: str, outcomes: dict) -> None:
+    r = await client.post(
+        "/api/v1/auth/login", data={"username": email, "password": password}
+    )
+    outcomes[r.status_code] = outcomes.get(r.status_code, 0) + 1
+
+
+async def _measure(client, readers: int, duration: float, logins: int, creds):
+    stop = asyncio.Event()
+    samples: list[float] = []
+    outcomes: dict[int, int] = {}
+    tasks = [asyncio.create_task(_reader(client, stop, samples)) for _ in range(readers)]
+
+    started = time.perf_counter()
+    if logins:
+        await asyncio.gather(*(_login(client, *creds, outcomes) for _ in range(logins)))
+    remaining = duration - (time.perf_counter() - started)
+    if remaining > 0:
+        await asyncio.sleep(remaining)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await asyncio.gather(*tasks)
+    result = {"items": _summary(samples), "elapsed_s": round(elapsed, 2)}
+    if logins:
+        result["login_status_counts"] = outcomes
+    return result
+
+
+async def main(args) -> dict:
+    import httpx
+
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.main import app
+    from app.models.item import Item
+    from app.models.user import User
+    from app.core.security import hash_password, shutdown_password_hasher
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    email, password = "storm@example.com", "storm-password"
+    db.add(
+        User(
+            email=email,
+            full_name="Storm",
+            hashed_password=hash_password(password),
+            role="shop",
+        )
+    )
+    for i in range(args.items):
+        db.add(
+            Item(
+                item_number=f"BENCH-{i}",
+                name=f"Item {i}",
+                description="benchmark item",
+                qty_per_purchase=1,
+                qty_in_stock=100,
+                price=1,
+                category="Office Supplies",
+            )
+        )
+    db.commit()
+    db.close()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # warm up pools before measuring
+        await _login(client, email, password, {})
+        baseline = await _measure(client, args.readers, args.duration, 0, None)
+        storm = await _measure(
+            client, args.readers, args.duration, args.logins, (email, password)
+        )
+
+    shutdown_password_hasher()
+    return {
+        "password_hash_workers": os.getenv("PASSWORD_HASH_WORKERS", "default"),
+        "baseline": baseline,
+        "login_storm": storm,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--items", type=int, default=500)
+    args = parser.parse_args()
+
+    db_path = _setup_database()
+    try:
+        print(json.dumps(asyncio.run(main(args)), indent=2))
+    finally:
+        os.remove(db_path)
@@ -0,0 +1,34 @@
+// Writes .br and .gz siblings next to compressible files in dist/assets so
+// the backend can serve them without compressing on every request.
+import { readdir, readFile, writeFile } from "node:fs/promises";
+import { join } from "node:path";
+import process from "node:process";
+import { brotliCompressSync, constants, gzipSync } from "node:zlib";
+
+const ASSETS_DIR = join(import.meta.dirname, "..", "dist", "assets");
+const COMPRESSIBLE = /\.(js|mjs|css|html|svg|json|txt|map)$/;
+const MIN_BYTES = 1024;
+
+let count = 0;
+for (const name of await readdir(ASSETS_DIR)) {
+  if (!COMPRESSIBLE.test(name)) continue;
+
+  const path = join(ASSETS_DIR, name);
+  const source = await readFile(path);
+  if (source.length < MIN_BYTES) continue;
+
+  const br = brotliCompressSync(source, {
+    params: {
+      [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY,
+      [constants.BROTLI_PARAM_SIZE_HINT]: source.length,
+    },
+  });
+  const gz = gzipSync(source, { level: 9 });
+
+  // Only keep an encoding if it is actually smaller
+  if (br.length < source.length) await writeFile(`${path}.br`, br);
+  if (gz.length < source.length) await writeFile(`${path}.gz`, gz);
+  count += 1;
+}
+
+process.stdout.write(`precompressed ${count} assets\n`);
@@ -18,6 +18,31 @@ function setToken(token) {
 }
 function clearToken() {
   localStorage.removeItem("access_token");
+  localStorage.removeItem("refresh_token");
+}
+function getRefreshToken() {
+  return localStorage.getItem("refresh_token");
+}
+function setRefreshToken(token) {
+  if (token) localStorage.setItem("refresh_token", token);
+}
+
+async function apiRefresh(refreshToken) {
+  const res = await fetch("/api/v1/auth/refresh", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ refresh_token: refreshToken }),
+  });
+  if (!res.ok) throw new Error("Refresh failed");
+  return res.json();
+}
+
+async function apiLogout(refreshToken) {
+  await fetch("/api/v1/auth/logout", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ refresh_token: refreshToken }),
+  }).catch(() => null);
 }
 
 async function apiGetMe(token) {
@@ -130,6 +155,19 @@ export default function App() {
       const data = await apiGetMe(currentToken);
       setMe(data);
     } catch {
+      // Access token expired: trade the refresh token instead of a re-login
+      const refreshToken = getRefreshToken();
+      if (refreshToken) {
+        try {
+          const tokens = await apiRefresh(refreshToken);
+          setToken(tokens.access_token);
+          setRefreshToken(tokens.refresh_token);
+          setTokenState(tokens.access_token);
+          return;
+        } catch {
+          clearToken();
+        }
+      }
       setMe(null);
     } finally {
       setAuthChecked(true);
@@ -153,6 +191,7 @@ export default function App() {
       const data = await apiLogin(email, password);
 
       setToken(data.access_token);
+      setRefreshToken(data.refresh_token);
       setTokenState(data.access_token);
 
       const user = await apiGetMe(data.access_token);
@@ -166,6 +205,8 @@ export default function App() {
   }
 
   function onLogout() {
+    const refreshToken = getRefreshToken();
+    if (refreshToken) apiLogout(refreshToken);
     clearToken();
     setTokenState(null);
     setMe(null);
@@ -5,10 +5,13 @@ function getToken() {
   return localStorage.getItem("access_token");
 }
 
-async function apiListItems() {
-  const res = await fetch("/api/v1/items/");
+async function apiListItems(cursor = "") {
+  // /items/ is keyset-paginated: one page per call, X-Next-Cursor for the next
+  const params = new URLSearchParams({ limit: "100" });
+  if (cursor) params.set("cursor", cursor);
+  const res = await fetch(`/api/v1/items/?${params}`);
   if (!res.ok) throw new Error("Failed to load items");
-  return res.json();
+  return { items: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") || "" };
 }
 
 async function apiCreateItem(item) {
@@ -129,6 +132,8 @@ function InventoryRow({ item, selected, onClick, onDelete, onEdit }) {
 
 export default function AdminInventoryPage() {
   const [items, setItems] = useState([]);
+  const [nextCursor, setNextCursor] = useState("");
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedItemNumber, setSelectedItemNumber] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
@@ -163,9 +168,10 @@ export default function AdminInventoryPage() {
     try {
       setError("");
       setLoading(true);
-      const data = await apiListItems();
-      setItems(data);
-      setSelectedItemNumber((prev) => prev || data[0]?.item_number || null);
+      const page = await apiListItems();
+      setItems(page.items);
+      setNextCursor(page.nextCursor);
+      setSelectedItemNumber((prev) => prev || page.items[0]?.item_number || null);
     } catch (e) {
       setError(e?.message || "Failed to load items");
     } finally {
@@ -173,6 +179,20 @@ export default function AdminInventoryPage() {
     }
   }
 
+  async function loadMore() {
+    try {
+      setError("");
+      setLoadingMore(true);
+      const page = await apiListItems(nextCursor);
+      setItems((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (e) {
+      setError(e?.message || "Failed to load items");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   useEffect(() => { load(); }, []);
 
   const selected = useMemo(() => {
@@ -309,6 +329,13 @@ export default function AdminInventoryPage() {
               ))}
               {!loading && items.length === 0 ? <div className="p-3 text-muted">No items yet.</div> : null}
             </div>
+            {nextCursor ? (
+              <div className="card-footer text-center">
+                <button className="btn btn-sm btn-outline-secondary" onClick={loadMore} disabled={loadingMore}>
+                  {loadingMore ? "Loading…" : "Load more"}
+                </button>
+              </div>
+            ) : null}
           </div>
 
           <div className="card shadow-sm mt-3">
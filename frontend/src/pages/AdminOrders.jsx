@@ -1,13 +1,17 @@
 import { useEffect, useState } from "react";
+import { subscribeLiveEvents } from "../utils/liveEvents.js";
 
     
 function getToken() {
   return localStorage.getItem("access_token");
 }
 
-async function apiAllOrders() {
+async function apiAllOrders(cursor = "") {
   const token = getToken();
-  const res = await fetch("/api/v1/orders/", {
+  // Orders are keyset-paginated: one page per call, X-Next-Cursor for the next
+  const params = new URLSearchParams({ limit: "50" });
+  if (cursor) params.set("cursor", cursor);
+  const res = await fetch(`/api/v1/orders/?${params}`, {
     headers: { Authorization: `Bearer ${token}` },
   });
 
@@ -15,7 +19,7 @@ async function apiAllOrders() {
     const data = await res.json().catch(() => null);
     throw new Error(data?.detail || "Failed to load orders");
   }
-  return res.json();
+  return { orders: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") || "" };
 }
 
 async function apiSetStatus(orderId, statusValue) {
@@ -35,29 +39,50 @@ async function apiSetStatus(orderId, statusValue) {
 export default function AdminOrdersPage() {
     const [orders, setOrders] = useState([]);
     const [error, setError] = useState("");
+    const [nextCursor, setNextCursor] = useState("");
+    const [loadingMore, setLoadingMore] = useState(false);
 
     async function load() {
         try {
             setError("");
-            const data = await apiAllOrders();
-            setOrders(data);
+            const page = await apiAllOrders();
+            setOrders(page.orders);
+            setNextCursor(page.nextCursor);
         } catch (e) {
             setError(e?.message || "Failed to load orders");
         }
     }
 
-    useEffect(() => {
-    (async () => {
+    async function loadMore() {
         try {
-        setError("");
-        const data = await apiAllOrders();
-        setOrders(data);
+            setError("");
+            setLoadingMore(true);
+            const page = await apiAllOrders(nextCursor);
+            setOrders((prev) => [...prev, ...page.orders]);
+            setNextCursor(page.nextCursor);
         } catch (e) {
-        setError(e?.message || "Failed to load orders");
+            setError(e?.message || "Failed to load orders");
+        } finally {
+            setLoadingMore(false);
         }
-    })();
+    }
+
+    useEffect(() => {
+        load();
     }, []);
 
+    useEffect(
+      () =>
+        subscribeLiveEvents({
+          order_status_changed: ({ order_id, status }) =>
+            setOrders((prev) =>
+              prev.map((o) => (o.id === order_id ? { ...o, status } : o))
+            ),
+          resync: () => load(),
+        }),
+      []
+    );
+
 
   async function onChangeStatus(orderId, statusValue) {
     try {
@@ -121,6 +146,14 @@ export default function AdminOrdersPage() {
               </div>
             </div>
           ))}
+
+          {nextCursor ? (
+            <div className="text-center">
+              <button className="btn btn-outline-secondary" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? "Loading…" : "Load more"}
+              </button>
+            </div>
+          ) : null}
         </div>
       )}
     </div>
@@ -1,13 +1,17 @@
 import { useEffect, useState } from "react";
 import { useLocation } from "react-router-dom";
+import { subscribeLiveEvents } from "../utils/liveEvents.js";
 
 function getToken() {
   return localStorage.getItem("access_token");
 }
 
-async function apiMyOrders() {
+async function apiMyOrders(cursor = "") {
   const token = getToken();
-  const res = await fetch("/api/v1/orders/me", {
+  // Orders are keyset-paginated: one page per call, X-Next-Cursor for the next
+  const params = new URLSearchParams({ limit: "50" });
+  if (cursor) params.set("cursor", cursor);
+  const res = await fetch(`/api/v1/orders/me?${params}`, {
     headers: { Authorization: `Bearer ${token}` },
   });
 
@@ -15,7 +19,7 @@ async function apiMyOrders() {
     const data = await res.json().catch(() => null);
     throw new Error(data?.detail || "Failed to load orders");
   }
-  return res.json();
+  return { orders: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") || "" };
 }
 
 export default function OrdersPage() {
@@ -26,14 +30,17 @@ export default function OrdersPage() {
   const [orders, setOrders] = useState([]);
   const [error, setError] = useState("");
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState("");
+  const [loadingMore, setLoadingMore] = useState(false);
   const [lastUpdated, setLastUpdated] = useState(null);
 
   async function load({ silent = false } = {}) {
     try {
       if (!silent) setLoading(true);
       setError("");
-      const data = await apiMyOrders();
-      setOrders(Array.isArray(data) ? data : []);
+      const page = await apiMyOrders();
+      setOrders(page.orders);
+      setNextCursor(page.nextCursor);
       setLastUpdated(new Date());
     } catch (e) {
       setError(e?.message || "Failed to load orders");
@@ -42,12 +49,33 @@ export default function OrdersPage() {
     }
   }
 
+  async function loadMore() {
+    try {
+      setLoadingMore(true);
+      setError("");
+      const page = await apiMyOrders(nextCursor);
+      setOrders((prev) => [...prev, ...page.orders]);
+      setNextCursor(page.nextCursor);
+    } catch (e) {
+      setError(e?.message || "Failed to load orders");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   useEffect(() => {
     load();
 
-    // Poll every 10 seconds for status changes
-    const id = setInterval(() => load({ silent: true }), 10_000);
-    return () => clearInterval(id);
+    // Status changes are pushed by the server instead of polled
+    return subscribeLiveEvents({
+      order_status_changed: ({ order_id, status }) => {
+        setOrders((prev) =>
+          prev.map((o) => (o.id === order_id ? { ...o, status } : o))
+        );
+        setLastUpdated(new Date());
+      },
+      resync: () => load({ silent: true }),
+    });
   }, []);
 
   return (
@@ -123,6 +151,18 @@ export default function OrdersPage() {
               </div>
             </div>
           ))}
+
+          {nextCursor ? (
+            <div className="text-center">
+              <button
+                className="btn btn-outline-secondary"
+                onClick={loadMore}
+                disabled={loadingMore}
+              >
+                {loadingMore ? "Loading…" : "Load more"}
+              </button>
+            </div>
+          ) : null}
         </div>
       )}
     </div>
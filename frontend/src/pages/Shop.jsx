@@ -1,12 +1,27 @@
 import { useEffect, useMemo, useState } from "react";
 import { useLocation } from "react-router-dom";
 import { useCart } from "../context/CartContext.jsx";
+import { subscribeLiveEvents } from "../utils/liveEvents.js";
 const API_BASE = (import.meta.env.VITE_API_BASE_URL || "").replace(/\/$/, "");
 
 
-async function apiListItems() {
-  const res = await fetch("/api/v1/items/");
+const PAGE_SIZE = 60;
+
+async function apiListItems({ cursor = "", category = "", sub = "" } = {}) {
+  // /items/ is keyset-paginated: one page per call, X-Next-Cursor for the next
+  const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+  if (cursor) params.set("cursor", cursor);
+  if (category) params.set("category", category);
+  if (sub) params.set("subcategory", sub);
+  const res = await fetch(`/api/v1/items/?${params}`);
   if (!res.ok) throw new Error("Failed to load inventory");
+  return { items: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") || "" };
+}
+
+async function apiSearchItems(q) {
+  const params = new URLSearchParams({ q, limit: "100" });
+  const res = await fetch(`/api/v1/items/search?${params}`);
+  if (!res.ok) throw new Error("Search failed");
   return res.json();
 }
 
@@ -33,11 +48,29 @@ function InventoryCard({ me, item, onAdd }) {
         }}
       >
         {item.image_url ? (
-          <img
-            src={item.image_url ? `${API_BASE}${item.image_url}` : ""}
-            alt={item.name}
-            className="card-img"
-          />
+          <picture>
+            {item.image_variants ? (
+              <source
+                type="image/webp"
+                srcSet={`${API_BASE}${item.image_variants.card.webp}`}
+              />
+            ) : null}
+            <img
+              src={`${API_BASE}${item.image_variants?.card.jpg || item.image_url}`}
+              alt={item.name}
+              className="card-img"
+              loading="lazy"
+              onError={(e) => {
+                // Derivatives are built in the background; fall back to the original
+                const original = `${API_BASE}${item.image_url}`;
+                const picture = e.currentTarget.parentElement;
+                picture.querySelectorAll("source").forEach((el) => el.remove());
+                if (e.currentTarget.src !== new URL(original, window.location.href).href) {
+                  e.currentTarget.src = original;
+                }
+              }}
+            />
+          </picture>
         ) : (
           <div className="text-muted">No image</div>
         )}
@@ -93,16 +126,21 @@ export default function ShopPage({ me }) {
   const sub = query.get("sub") || "";
 
   const [items, setItems] = useState([]);
+  const [nextCursor, setNextCursor] = useState("");
+  const [results, setResults] = useState(null); // search results, or null
   const [q, setQ] = useState("");
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState("");
+  const term = q.trim();
 
   async function load() {
     try {
       setError("");
       setLoading(true);
-      const data = await apiListItems();
-      setItems(data);
+      const page = await apiListItems({ category, sub });
+      setItems(page.items);
+      setNextCursor(page.nextCursor);
     } catch (e) {
       setError(e?.message || "Failed to load inventory");
     } finally {
@@ -110,6 +148,20 @@ export default function ShopPage({ me }) {
     }
   }
 
+  async function loadMore() {
+    try {
+      setError("");
+      setLoadingMore(true);
+      const page = await apiListItems({ cursor: nextCursor, category, sub });
+      setItems((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (e) {
+      setError(e?.message || "Failed to load inventory");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   
   function showToast(msg) {
     const id = Date.now() + Math.random();
@@ -124,24 +176,54 @@ export default function ShopPage({ me }) {
 
   useEffect(() => {
     load();
-  }, []);
+  }, [category, sub]);
+
+  // Searches go to the server, so they cover items not loaded yet
+  useEffect(() => {
+    if (!term) {
+      setResults(null);
+      return undefined;
+    }
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      apiSearchItems(term)
+        .then((data) => !cancelled && setResults(data))
+        .catch((e) => !cancelled && setError(e?.message || "Search failed"));
+    }, 250);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [term]);
+
+  // Stock levels are pushed live to signed-in users
+  useEffect(() => {
+    if (!me) return undefined;
+    return subscribeLiveEvents({
+      stock_changed: ({ item_number, qty_in_stock }) => {
+        const update = (prev) =>
+          prev &&
+          prev.map((it) =>
+            it.item_number === item_number ? { ...it, qty_in_stock } : it
+          );
+        setItems(update);
+        setResults(update);
+      },
+      catalog_changed: () => load(),
+      resync: () => load(),
+    });
+  }, [me, category, sub]);
 
   const filtered = useMemo(() => {
-    const term = q.trim().toLowerCase();
-
-    return items
-      .filter((it) => {
-        if (!category) return true;
-        if (it.category !== category) return false;
-        if (sub && it.subcategory !== sub) return false;
-        return true;
-      })
-      .filter((it) => {
-        if (!term) return true;
-        const hay = `${it.item_number} ${it.name} ${it.description}`.toLowerCase();
-        return hay.includes(term);
-      });
-  }, [items, q, category, sub]);
+    if (!term) return items;
+
+    return (results || []).filter((it) => {
+      if (!category) return true;
+      if (it.category !== category) return false;
+      if (sub && it.subcategory !== sub) return false;
+      return true;
+    });
+  }, [items, results, term, category, sub]);
 
   return (
     <div className="container py-4">
@@ -237,10 +319,22 @@ export default function ShopPage({ me }) {
           </div>
         ))}
 
-        {!loading && filtered.length === 0 ? (
+        {!loading && filtered.length === 0 && !(term && results === null) ? (
           <div className="text-muted mt-3">No items match your search.</div>
         ) : null}
       </div>
+
+      {!term && nextCursor ? (
+        <div className="text-center mt-4">
+          <button
+            className="btn btn-outline-secondary"
+            onClick={loadMore}
+            disabled={loadingMore}
+          >
+            {loadingMore ? "Loading…" : "Load more"}
+          </button>
+        </div>
+      ) : null}
     </div>
   );
 }
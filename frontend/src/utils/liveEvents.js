@@ -0,0 +1,51 @@
+// src/utils/liveEvents.js
+
+// Live updates from GET /api/v1/events (server-sent events).
+// handlers maps an event name ("stock_changed", "order_status_changed",
+// "resync") to a callback that receives the parsed payload.
+// Returns a function that closes the stream.
+export function subscribeLiveEvents(handlers) {
+  let source = null;
+  let retryTimer = null;
+  let closed = false;
+
+  function open() {
+    const token = localStorage.getItem("access_token");
+    if (!token || closed) return;
+
+    // EventSource cannot send an Authorization header
+    const params = new URLSearchParams({ access_token: token });
+    source = new EventSource(`/api/v1/events?${params}`);
+
+    for (const [name, handler] of Object.entries(handlers)) {
+      source.addEventListener(name, (e) => {
+        try {
+          handler(JSON.parse(e.data));
+        } catch {
+          // ignore malformed payloads
+        }
+      });
+    }
+
+    // EventSource retries network errors itself (resuming via Last-Event-ID),
+    // but gives up on an HTTP error such as an expired token. Reopen with
+    // whatever token is current by then; a fresh stream cannot resume, so
+    // treat it as a resync.
+    source.onerror = () => {
+      if (source.readyState !== EventSource.CLOSED || closed) return;
+      source = null;
+      retryTimer = setTimeout(() => {
+        open();
+        handlers.resync?.({});
+      }, 5_000);
+    };
+  }
+
+  open();
+
+  return () => {
+    closed = true;
+    clearTimeout(retryTimer);
+    source?.close();
+  };
+}